@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Tuple
 
@@ -7,6 +9,10 @@ from node_editor.node import Node
 
 
 class Add_Node(Node):
+    memoize = True
+    process_safe = True
+    vectorized = True
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -37,17 +43,11 @@ class Add_Node(Node):
         # Assuming build is defined in the parent class
         super().build()
 
-    def compute(self) -> None:
-        a_pin = self.get_pin("input A")
-        b_pin = self.get_pin("input B")
-        out_pin = self.get_pin("output")
-
-        a = a_pin.value if a_pin and hasattr(a_pin, "value") else 0
-        b = b_pin.value if b_pin and hasattr(b_pin, "value") else 0
+    @staticmethod
+    def evaluate(inputs: Dict[str, Any], widget_state: Any) -> Dict[str, Any]:
+        a = inputs.get("input A", 0)
+        b = inputs.get("input B", 0)
 
         print(f"a: {a}, b: {b}")
 
-        result = a + b
-
-        if out_pin:
-            out_pin.value = result
+        return {"output": a + b}
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from node_editor.node import Node
+
+
+class Branch_Node(Node):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.title_text = "Branch"
+        self.type_text = "Flow Control"
+        self.set_color(title_color=(90, 90, 90))
+
+        self.add_pin(name="Ex In", is_output=False, execution=True)
+        self.add_pin(name="True", is_output=True, execution=True)
+        self.add_pin(name="False", is_output=True, execution=True)
+
+        self.add_pin(name="condition", is_output=False)
+        self.build()
+
+    def compute(self) -> None:
+        pin = self.get_pin("condition")
+        condition = pin.value if pin and hasattr(pin, "value") else False
+        # Only the chain of the chosen exec output runs
+        self.select_exec_outputs("True" if condition else "False")
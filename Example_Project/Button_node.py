@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from PySide6 import QtWidgets
-
 from node_editor.node import Node
 
 
@@ -18,6 +16,9 @@ class Button_Node(Node):
         self.build()
 
     def init_widget(self) -> None:
+        # Imported here so the node can be loaded headless, where no widget is built
+        from PySide6 import QtWidgets
+
         self.widget = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
@@ -33,6 +34,13 @@ class Button_Node(Node):
 
         super().init_widget()
 
+    def compute(self) -> None:
+        # The button only triggers execution, it has no value of its own
+        pass
+
     def btn_cmd(self) -> None:
         print("btn command")
-        self.execute()
+        # Has the editor run the nodes wired to the exec output, and only those, off the GUI thread
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "fire_exec"):
+            scene.fire_exec(self)
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from PySide6 import QtWidgets
+from typing import Any
 
-from Example_Project.common_widgets import FloatLineEdit
 from node_editor.node import Node
 
 
@@ -16,14 +15,23 @@ class Scaler_Node(Node):
 
         self.add_pin(name="value", is_output=True)
 
+        # Kept in sync with the line edit so compute never has to touch the widget from a worker thread
+        self.scaler_value = 0.0
+
         self.build()
 
     def init_widget(self) -> None:
+        # Imported here so the node can be loaded headless, where no widget is built
+        from PySide6 import QtWidgets
+
+        from Example_Project.common_widgets import FloatLineEdit
+
         self.widget = QtWidgets.QWidget()
         self.widget.setFixedWidth(100)
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         self.scaler_line = FloatLineEdit()
+        self.scaler_line.textChanged.connect(self.on_text_changed)
         layout.addWidget(self.scaler_line)
         self.widget.setLayout(layout)
 
@@ -33,8 +41,20 @@ class Scaler_Node(Node):
 
         super().init_widget()
 
+    def on_text_changed(self, text: str) -> None:
+        self.scaler_value = self.scaler_line.value()
+        self.mark_dirty()
+
+    def get_widget_state(self) -> float:
+        return self.scaler_value
+
+    def set_widget_state(self, state: Any) -> None:
+        self.scaler_value = float(state)
+        if hasattr(self, "scaler_line"):  # Only built in the editor
+            self.scaler_line.setText(str(self.scaler_value))
+
     def compute(self) -> None:
-        value = self.scaler_line.value()
+        value = self.scaler_value
         print(f"value: {value}")
         pin = self.get_pin("value")
         if pin:
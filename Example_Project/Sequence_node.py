@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from node_editor.node import Node
+
+
+class Sequence_Node(Node):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.title_text = "Sequence"
+        self.type_text = "Flow Control"
+        self.set_color(title_color=(90, 90, 90))
+
+        self.add_pin(name="Ex In", is_output=False, execution=True)
+        # Exec outputs fire in the order they are added, each chain running to completion before the next
+        self.add_pin(name="Then 0", is_output=True, execution=True)
+        self.add_pin(name="Then 1", is_output=True, execution=True)
+        self.build()
+
+    def compute(self) -> None:
+        pass
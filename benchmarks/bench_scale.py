@@ -0,0 +1,227 @@
+"""
+Times the editor's scene operations on large synthetic graphs and compares them against stored baselines.
+
+Usage:
+    python benchmarks/bench_scale.py [--sizes 1000 10000] [--shapes chain wide-fan random-dag]
+        [--tolerance 1.0] [--update-baseline]
+
+The graphs are built from the Example_Project node types and loaded into a NodeWidget on the offscreen Qt platform,
+so no display is needed. For every shape and size, this times NodeWidget.load_scene, NodeWidget.save_project,
+compute_dag_nodes, NodeScene.get_items_by_type and NodeScene.delete_node_and_reorder.
+
+Timings are compared against benchmarks/baselines.json. The script exits with status 1 if any of them is slower
+than its baseline by more than the tolerance. Baselines depend on the machine, so regenerate them with
+--update-baseline when moving to another one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+SHAPES = ("chain", "wide-fan", "random-dag")
+SIZES = (1000, 10000, 100000)
+# load_scene takes minutes at 10k nodes, so the 100k graphs only run when asked for with --sizes
+DEFAULT_SIZES = (1000, 10000)
+
+# Timings under this many seconds are too noisy to compare by ratio alone
+MIN_SLACK = 0.02
+
+
+def _node(node_type: str, index: int, state: Any = None) -> Dict[str, Any]:
+    node = {"type": node_type, "x": 100 * (index % 100), "y": 100 * (index // 100), "index": str(index)}
+    if state is not None:
+        node["state"] = state
+    return node
+
+
+def _connection(start: int, start_pin: str, end: int, end_pin: str) -> Dict[str, str]:
+    return {"start_id": str(start), "end_id": str(end), "start_pin": start_pin, "end_pin": end_pin}
+
+
+def make_graph(shape: str, size: int, seed: int = 0) -> Dict[str, List[Any]]:
+    """
+    Synthesizes a graph of `size` nodes in the format written by NodeWidget.save_project.
+
+    - "chain": a Scaler followed by a single line of Adds, each adding the previous one.
+    - "wide-fan": a single Scaler feeding every Add.
+    - "random-dag": a third of Scalers, then Adds whose inputs are random earlier outputs.
+    """
+    nodes: List[Dict[str, Any]] = []
+    connections: List[Dict[str, str]] = []
+
+    if shape == "chain":
+        nodes.append(_node("Scaler_Node", 0, 1.0))
+        for i in range(1, size):
+            nodes.append(_node("Add_Node", i))
+            connections.append(_connection(i - 1, "value" if i == 1 else "output", i, "input A"))
+
+    elif shape == "wide-fan":
+        nodes.append(_node("Scaler_Node", 0, 1.0))
+        for i in range(1, size):
+            nodes.append(_node("Add_Node", i))
+            connections.append(_connection(0, "value", i, "input A"))
+
+    elif shape == "random-dag":
+        rng = random.Random(seed)
+        num_sources = max(1, size // 3)
+        outputs = []  # As (node index, pin name)
+        for i in range(size):
+            if i < num_sources:
+                nodes.append(_node("Scaler_Node", i, float(i)))
+                outputs.append((i, "value"))
+                continue
+            nodes.append(_node("Add_Node", i))
+            for end_pin in ("input A", "input B"):
+                start, start_pin = outputs[rng.randrange(len(outputs))]
+                connections.append(_connection(start, start_pin, i, end_pin))
+            outputs.append((i, "output"))
+
+    else:
+        raise ValueError(f"Unknown shape: {shape}")
+
+    return {"nodes": nodes, "connections": connections}
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    # The scene and the nodes print as they go, which would drown the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _time(func: Callable[[], Any], repeat: int = 1) -> float:
+    timings = []
+    for _ in range(repeat):
+        # Like timeit, keep the garbage of earlier graphs from being collected in the middle of a timing
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            with _quiet():
+                func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return statistics.median(timings)
+
+
+def bench_graph(shape: str, size: int, imports: Dict[str, Dict[str, Any]], workdir: Path) -> Dict[str, float]:
+    from PySide6 import QtWidgets
+
+    from node_editor.compute_graph import compute_dag_nodes
+    from node_editor.connection import Connection
+    from node_editor.gui.node_widget import NodeWidget
+    from node_editor.node import Node
+
+    graph_path = workdir / f"{shape}-{size}.json"
+    with open(graph_path, "w") as f:
+        json.dump(make_graph(shape, size), f)
+
+    widget = NodeWidget()
+    scene = widget.scene
+    results = {}
+
+    results["load_scene"] = _time(lambda: widget.load_scene(str(graph_path), imports))
+    results["save_project"] = _time(lambda: widget.save_project(str(workdir / "saved.json")), repeat=3)
+
+    with _quiet():
+        nodes = scene.get_items_by_type(Node)
+        connections = scene.get_items_by_type(Connection)
+    results["compute_dag_nodes"] = _time(lambda: compute_dag_nodes(nodes, connections, only_dirty=False))
+    results["get_items_by_type"] = _time(lambda: scene.get_items_by_type(Node), repeat=5)
+
+    deletions = iter(nodes[:5])
+    results["delete_node_and_reorder"] = _time(lambda: scene.delete_node_and_reorder(next(deletions)), repeat=5)
+
+    scene.clear()
+    widget.deleteLater()
+    QtWidgets.QApplication.processEvents()
+    return results
+
+
+def compare(results: Dict[str, float], baselines: Dict[str, float], tolerance: float) -> List[str]:
+    """Returns a description of every timing slower than its baseline by more than the tolerance."""
+    regressions = []
+    for key, seconds in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        if seconds > baseline * (1 + tolerance) + MIN_SLACK:
+            regressions.append(f"{key}: {seconds:.4f}s vs {baseline:.4f}s baseline ({seconds / baseline:.1f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the node editor on large graphs.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help=f"The numbers of nodes, e.g. {SIZES}"
+    )
+    parser.add_argument("--shapes", choices=SHAPES, nargs="+", default=SHAPES, help="The graph shapes")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="The allowed slowdown, 1.0 is twice as slow")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the timings as the new baselines")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(ROOT))
+
+    from PySide6 import QtWidgets
+
+    from node_editor.project import load_node_modules
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])  # noqa: F841
+    imports = load_node_modules(ROOT / "Example_Project")
+
+    baselines: Dict[str, float] = {}
+    if BASELINES.exists():
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for shape in args.shapes:
+            for size in args.sizes:
+                for operation, seconds in bench_graph(shape, size, imports, Path(workdir)).items():
+                    key = f"{shape}/{size}/{operation}"
+                    results[key] = seconds
+                    baseline = baselines.get(key)
+                    vs = f"  (baseline {baseline:.4f}s)" if baseline is not None else ""
+                    print(f"{key:<45} {seconds:10.4f}s{vs}", flush=True)
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(BASELINES, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=4)
+            f.write("\n")
+        print(f"Baselines written to {BASELINES}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} REGRESSION(S) against {BASELINES.name}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
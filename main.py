@@ -1,6 +1,4 @@
 from pathlib import Path
-import importlib.util
-import inspect
 import logging
 import sys
 from typing import Any, Dict, Optional
@@ -8,11 +6,20 @@ from typing import Any, Dict, Optional
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import QByteArray
 
-from node_editor.compute_graph import compute_dag_nodes
-from node_editor.connection import Connection
+from node_editor.cancellation import Cancelled
+from node_editor.compute_graph import CycleError
+from node_editor.compute_graph import execute_plan_async
+from node_editor.compute_graph import EXECUTION_MODES
+from node_editor.gui.async_bridge import AsyncioBridge
+from node_editor.gui.execution_thread import ExecutionThread
+from node_editor.gui.live_mode import LiveMode
 from node_editor.gui.node_list import NodeList
 from node_editor.gui.node_widget import NodeWidget
+from node_editor import disk_cache
+from node_editor import spill
 from node_editor.node import Node
+from node_editor.process_pool import shutdown_pool
+from node_editor.project import load_node_modules
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -25,6 +32,11 @@ class NodeEditor(QtWidgets.QMainWindow):  # type: ignore
         self.settings: QtCore.QSettings = QtCore.QSettings("node-editor", "NodeEditor")
         self.project_path: Optional[Path] = None
         self.imports: Optional[Dict[str, Dict[str, Any]]] = None
+        self.async_bridge: AsyncioBridge = AsyncioBridge(self)
+        self.async_bridge.finished.connect(self.on_async_execution_finished)
+        # Runs the other modes in the background so a slow node doesn't freeze the editor
+        self.execution_thread: ExecutionThread = ExecutionThread(self)
+        self.execution_thread.finished.connect(self.on_execution_finished)
 
         icon_path = Path("resources") / "app.ico"
         self.setWindowIcon(QtGui.QIcon(str(icon_path)))
@@ -46,14 +58,33 @@ class NodeEditor(QtWidgets.QMainWindow):  # type: ignore
         execute_button = QtWidgets.QPushButton("Execute Graph")
         execute_button.setFixedHeight(40)
         execute_button.clicked.connect(self.execute_graph)
+        self.cancel_button: QtWidgets.QPushButton = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.setToolTip("Stop the execution once the nodes that are running are done")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_execution)
+        self.mode_combo: QtWidgets.QComboBox = QtWidgets.QComboBox()
+        for mode in EXECUTION_MODES:
+            self.mode_combo.addItem(mode.title(), mode)
         self.node_widget: NodeWidget = NodeWidget(self)
+        self.node_widget.scene.node_edited.connect(self.execution_thread.node_edited)
+        self.node_widget.scene.exec_fired.connect(self.fire_exec)
+        # Executes the graph again after every edit, see node_editor.gui.live_mode
+        self.live_mode: LiveMode = LiveMode(
+            self.node_widget.scene, self.execute_graph, (self.execution_thread, self.async_bridge), parent=self
+        )
+        live_checkbox = QtWidgets.QCheckBox("Live")
+        live_checkbox.setToolTip("Execute the affected nodes automatically after every edit")
+        live_checkbox.toggled.connect(self.live_mode.set_enabled)
 
         # Assemble layouts
         self.splitter.addWidget(left_widget)
         self.splitter.addWidget(self.node_widget)
         left_widget.setLayout(left_layout)
         left_layout.addWidget(self.node_list)
+        left_layout.addWidget(self.mode_combo)
+        left_layout.addWidget(live_checkbox)
         left_layout.addWidget(execute_button)
+        left_layout.addWidget(self.cancel_button)
         main_layout.addWidget(self.splitter)
 
         # Restore GUI layout
@@ -76,9 +107,55 @@ class NodeEditor(QtWidgets.QMainWindow):  # type: ignore
 
     def execute_graph(self) -> None:
         logging.info("Executing Graph")
-        nodes = self.node_widget.scene.get_items_by_type(Node)
-        edges = self.node_widget.scene.get_items_by_type(Connection)
-        compute_dag_nodes(nodes, edges)
+        mode = self.mode_combo.currentData()
+
+        try:
+            plan = self.node_widget.scene.get_execution_plan()
+        except CycleError as e:
+            logging.error(f"Can't execute graph: {e}")
+            return
+
+        if self.execution_thread.is_running() or self.async_bridge.is_running():
+            logging.warning("The graph is already executing")
+            return
+
+        if mode == "async":
+            # Runs on the Qt event loop so the editor stays responsive while nodes await
+            self.async_bridge.run(execute_plan_async(plan))
+        else:
+            self.execution_thread.run(plan, mode=mode)
+        self.cancel_button.setEnabled(True)
+
+    def fire_exec(self, trigger: Node) -> None:
+        logging.info(f"Firing node {trigger.index}")
+        if self.execution_thread.is_running() or self.async_bridge.is_running():
+            logging.warning("The graph is already executing")
+            return
+
+        # Runs in the background like the Execute button, so the chain can be cancelled and its nodes time out
+        self.execution_thread.fire(trigger)
+        self.cancel_button.setEnabled(True)
+
+    def cancel_execution(self) -> None:
+        logging.info("Cancelling execution")
+        self.execution_thread.cancel()
+        self.async_bridge.cancel()
+
+    def on_execution_finished(self) -> None:
+        self.cancel_button.setEnabled(self.async_bridge.is_running())
+        error = self.execution_thread.error
+        if isinstance(error, Cancelled):
+            logging.info("Execution cancelled")
+        elif error is not None:
+            logging.error(f"Graph execution failed: {error}")
+
+    def on_async_execution_finished(self) -> None:
+        self.cancel_button.setEnabled(self.execution_thread.is_running())
+        error = self.async_bridge.error
+        if isinstance(error, CycleError):
+            logging.error(f"Can't execute graph: {error}")
+        elif error is not None:
+            logging.error(f"Graph execution failed: {error}")
 
     def save_project(self) -> None:
         file_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Project", "", "JSON files (*.json);;All files (*)")
@@ -95,28 +172,9 @@ class NodeEditor(QtWidgets.QMainWindow):  # type: ignore
             return
 
         self.project_path = project_path
-        self.imports = {}
-
-        for file in project_path.glob("*.py"):
-            if not file.stem.endswith("_node"):
-                logging.debug(f"Skipping file: {file.stem}")
-                continue
-
-            try:
-                spec = importlib.util.spec_from_file_location(file.stem, file)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                else:
-                    logging.warning(f"Could not load spec for {file}")
-                    continue
-            except Exception as e:
-                logging.error(f"Failed to import {file.name}: {e}")
-                continue
-
-            for name, obj in inspect.getmembers(module):
-                if name.endswith("_Node") and inspect.isclass(obj):
-                    self.imports[obj.__name__] = {"class": obj, "module": module}
+        self.imports = load_node_modules(project_path)
+        # Memoized results are kept with the project, so they are reused the next time it is opened
+        disk_cache.enable(str(project_path / disk_cache.PROJECT_CACHE_DIR))
 
         self.node_list.update_project(self.imports)
 
@@ -130,8 +188,13 @@ class NodeEditor(QtWidgets.QMainWindow):  # type: ignore
             self.load_project(Path(project_path))
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self.live_mode.set_enabled(False)
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.setValue("splitterSize", self.splitter.saveState())
+        self.execution_thread.close()
+        shutdown_pool()
+        spill.disable()
+        self.async_bridge.close()
         super().closeEvent(event)
 
 
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from node_editor.cancellation import CancelToken
+from node_editor.cancellation import node_scope
+from node_editor.cancellation import NodeTimeout
+from node_editor.executors import computes_privately
+from node_editor.executors import finish_node
+from node_editor.executors import needs_execution
+from node_editor.executors import run_node
+from node_editor.executors import stop_if_cancelled
+from node_editor.executors import timeout_of
+from node_editor.executors import upstream_failed
+from node_editor.liveness import Liveness
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.node import Node
+    from node_editor.pin import Pin
+
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+async def run_node_async(
+    node: Node,
+    bindings: Optional[Sequence[Tuple[Pin, Pin]]] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Optional[Exception]:
+    """
+    Executes a single node on the running event loop. Returns the exception it raised, if any.
+
+    With a timeout, a node whose compute is still awaiting when the time is up is cancelled and fails with
+    NodeTimeout. Nodes that compute privately are run by executors.run_node on a worker thread instead, so they time
+    out like in the threaded mode without blocking the loop. Other regular computes block the loop, so they can only
+    stop early through cancellation.check(), and fail with NodeTimeout if they return late.
+    """
+    if timeout is not None and computes_privately(node) and not node.main_thread_only:
+        return await asyncio.get_running_loop().run_in_executor(None, run_node, node, bindings, timeout, cancel)
+
+    start = time.monotonic()
+    try:
+        print(f"\n--- Executing Node {node.index} ({node.__class__.__name__}) ---")
+        with node_scope(cancel, timeout):
+            await asyncio.wait_for(node.execute_async(bindings), timeout)
+    except asyncio.TimeoutError as e:
+        if timeout is None:  # Raised by the compute itself
+            print(f"Error executing node {node.index}: {e}")
+            return e
+        print(f"Node {node.index} ({node.__class__.__name__}) timed out after {timeout:g} seconds")
+        return NodeTimeout(timeout)
+    except Exception as e:
+        print(f"Error executing node {node.index}: {e}")
+        return e
+    if timeout is not None and time.monotonic() - start > timeout:
+        print(f"Node {node.index} ({node.__class__.__name__}) timed out after {timeout:g} seconds")
+        return NodeTimeout(timeout)
+    return None
+
+
+async def execute_async(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    max_in_flight: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes the nodes on the running event loop, awaiting independent nodes concurrently.
+
+    Each node is started as soon as its upstream nodes are done. Nodes with an `async def` compute overlap while
+    they await (subprocesses, file I/O...). Nodes with a regular compute run to completion when they are started.
+
+    Args:
+        plan: The compiled graph to execute.
+        only_dirty: Skip CLEAN nodes whose upstream nodes didn't run.
+        max_in_flight: The maximum number of nodes executing at once.
+        release_values: Drop every intermediate value as soon as the last node reading it is done, see
+            node_editor.liveness.
+        cancel, node_timeout: See node_editor.executors.execute_threaded.
+
+    Raises:
+        Cancelled: If the execution was cancelled.
+    """
+    nodes, schedule = plan.nodes, plan.schedule
+    limit = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+    remaining = schedule.in_degrees()
+    executed = [False] * len(nodes)
+    failed = [False] * len(nodes)
+    ready: Deque[int] = deque(v for v in range(len(nodes)) if remaining[v] == 0)
+    pending: Set[asyncio.Task[Tuple[int, Optional[Exception]]]] = set()
+    liveness = Liveness(plan) if release_values else None
+
+    def complete(node_index: int) -> None:
+        if liveness is not None:
+            liveness.done(node_index)
+        for successor in schedule.successors[node_index]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+
+    async def run(node_index: int) -> Tuple[int, Optional[Exception]]:
+        node = nodes[node_index]
+        timeout = timeout_of(node, node_timeout)
+        return node_index, await run_node_async(node, plan.bindings[node_index], timeout, cancel)
+
+    while ready or pending:
+        stop_if_cancelled(cancel, ready)
+        while ready and len(pending) < limit:
+            node_index = ready.popleft()
+            if upstream_failed(node_index, nodes, schedule, failed) or (
+                only_dirty and not needs_execution(node_index, nodes, schedule, executed)
+            ):
+                complete(node_index)
+                continue
+
+            executed[node_index] = True
+            pending.add(asyncio.ensure_future(run(node_index)))
+
+        if not pending:
+            continue
+
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            node_index, error = task.result()
+            failed[node_index] = error is not None
+            finish_node(nodes[node_index], error)
+            complete(node_index)
+
+    if cancel is not None:
+        cancel.check()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from node_editor.common import Node_Status
+from node_editor.executors import finish_node
+from node_editor.executors import run_node
+from node_editor.executors import upstream_failed
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, vectorized nodes fall back to a per-element loop without it
+    np = None
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.node import Node
+    from node_editor.pin import Pin
+
+
+def as_column(values: Sequence[Any]) -> Any:
+    """Returns the values as a NumPy array when NumPy is available, so vectorized nodes can operate on them."""
+    if np is not None and not isinstance(values, np.ndarray):
+        return np.asarray(values)
+    return values
+
+
+def execute_batch(plan: ExecutionPlan, columns: Mapping[Pin, Sequence[Any]]) -> int:
+    """
+    Executes the graph once over a whole batch of values.
+
+    The given output pins emit a column of values (a NumPy array or any sequence) instead of computing a single
+    value. Every node downstream of them is batched:
+
+    - Nodes that set `vectorized` receive whole columns on their batched input pins and compute once.
+    - Other nodes are computed once per row, and their output pins are filled with the column of results.
+
+    Nodes that aren't downstream of a column are executed once as usual. The nodes downstream of a node that failed
+    are skipped and left DIRTY, like in the regular executors. Since batched pins are left holding columns, the
+    batched nodes are marked DIRTY afterwards so the next regular execution recomputes them.
+
+    Args:
+        plan: The compiled graph.
+        columns: The values of the batch, by output pin. All columns must have the same length.
+
+    Returns:
+        The number of rows in the batch.
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All batch columns must have the same length, got {sorted(lengths)}")
+    num_rows = lengths.pop() if lengths else 0
+
+    print(f"=== Computing DAG Nodes over a batch of {num_rows} ===")
+
+    batched = {id(pin) for pin in columns}  # The output pins holding a column
+    batched_nodes = set()
+    for pin, values in columns.items():
+        pin.value = values
+        batched_nodes.add(id(pin.node))
+
+    failed = [False] * len(plan.nodes)
+    for node_index in plan.schedule.order:
+        node = plan.nodes[node_index]
+        bindings = plan.bindings[node_index]
+
+        if id(node) in batched_nodes and not any(id(output_pin) in batched for _, output_pin in bindings):
+            # A source node whose outputs are given by the batch
+            continue
+        if upstream_failed(node_index, plan.nodes, plan.schedule, failed):
+            continue
+
+        batched_inputs = [pin for pin, output_pin in bindings if id(output_pin) in batched]
+        if not batched_inputs:
+            error = run_node(node, bindings)
+            failed[node_index] = error is not None
+            finish_node(node, error)
+            continue
+
+        batched_nodes.add(id(node))
+        print(f"\n--- Executing Node {node.index} ({node.__class__.__name__}) over {num_rows} rows ---")
+        try:
+            if node.vectorized and np is not None:
+                node.execute_inputs(bindings)
+                for pin in batched_inputs:
+                    pin.value = as_column(pin.value)
+                _compute(node)
+                node.execute_outputs()
+            else:
+                _execute_rows(node, bindings, batched_inputs, num_rows)
+        except Exception as e:
+            print(f"Error executing node {node.index}: {e}")
+            failed[node_index] = True
+            finish_node(node, e)
+            continue
+
+        for pin in node._pins:
+            if pin.is_output and not pin.execution:
+                batched.add(id(pin))
+        finish_node(node, None)
+
+    # Pins are left holding columns, so make sure the next regular execution recomputes them
+    for node in plan.nodes:
+        if id(node) in batched_nodes and node.status == Node_Status.CLEAN:
+            node.mark_dirty()
+
+    return num_rows
+
+
+def _compute(node: Node) -> None:
+    if node.memoize:
+        node.compute_memoized()
+    else:
+        node.run_compute()
+
+
+def _execute_rows(node: Node, bindings: Sequence[Tuple[Pin, Pin]], batched_inputs: List[Pin], num_rows: int) -> None:
+    node.execute_inputs(bindings)
+    inputs = [(pin, pin.value) for pin in batched_inputs]
+    outputs = [pin for pin in node._pins if pin.is_output and not pin.execution]
+    results: Dict[int, List[Any]] = {id(pin): [] for pin in outputs}
+
+    for row in range(num_rows):
+        for pin, column in inputs:
+            pin.value = column[row]
+        _compute(node)
+        node.execute_outputs()
+        for pin in outputs:
+            results[id(pin)].append(getattr(pin, "value", None))
+
+    for pin, column in inputs:
+        pin.value = column
+    for pin in outputs:
+        pin.value = results[id(pin)]
+
+
+def make_columns(plan: ExecutionPlan, rows: Mapping[str, Sequence[Any]]) -> Dict[Pin, Sequence[Any]]:
+    """
+    Resolves batch columns given as {"<node index>:<pin name>": values} to the output pins of the plan.
+
+    Raises:
+        KeyError: If a node or pin can't be found.
+    """
+    nodes = {str(node.index): node for node in plan.nodes}
+    columns: Dict[Pin, Sequence[Any]] = {}
+    for key, values in rows.items():
+        node_index, _, pin_name = key.partition(":")
+        if node_index not in nodes:
+            raise KeyError(f"No node with index {node_index}")
+        pin: Optional[Pin] = nodes[node_index].get_pin(pin_name)
+        if pin is None or not pin.is_output:
+            raise KeyError(f"No output pin {pin_name!r} on node {node_index}")
+        columns[pin] = values
+    return columns
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Any
+from typing import Optional
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only bytes-like buffers are handled without it
+    np = None
+
+# Buffers (NumPy arrays, bytearrays, memoryviews) are passed between pins by reference, never copied. To make that
+# safe, output pins publish them as read-only views: every consumer can read the same memory, and a consumer that
+# wants to mutate a buffer has to ask for its own copy with writable(). A chain of nodes can then pass a large array
+# along without duplicating it at each hop, and without one node's in-place edits leaking into another's inputs.
+#
+# Producers must not mutate a buffer after publishing it, since the views share its memory.
+
+
+def freeze(value: Any) -> Any:
+    """
+    Returns a read-only view of a writable buffer without copying it. Other values are returned as is.
+
+    - A writable NumPy array becomes a read-only view of the same data.
+    - A bytearray or a writable memoryview becomes a read-only memoryview.
+    """
+    if np is not None and isinstance(value, np.ndarray):
+        if not value.flags.writeable:
+            return value
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, bytearray):
+        return memoryview(value).toreadonly()
+    if isinstance(value, memoryview) and not value.readonly:
+        return value.toreadonly()
+    return value
+
+
+def is_frozen(value: Any) -> bool:
+    """Returns True if the value is a read-only buffer."""
+    if np is not None and isinstance(value, np.ndarray):
+        return not value.flags.writeable
+    if isinstance(value, memoryview):
+        return value.readonly
+    return isinstance(value, bytes)
+
+
+def writable(value: Any) -> Any:
+    """
+    Returns a buffer that can be mutated, copying it only if it is read-only (copy-on-write).
+
+    - A read-only NumPy array is copied into a new writable array.
+    - A read-only memoryview or bytes are copied into a bytearray.
+    - Writable buffers and other values are returned as is.
+    """
+    if np is not None and isinstance(value, np.ndarray):
+        return value.copy() if not value.flags.writeable else value
+    if isinstance(value, memoryview) and value.readonly:
+        return bytearray(value)
+    if isinstance(value, bytes):
+        return bytearray(value)
+    return value
+
+
+def picklable(value: Any) -> Any:
+    """Returns the value in a form that can be pickled, e.g. to send it to a worker process. Copies memoryviews."""
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
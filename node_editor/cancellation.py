@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+# Executions can be stopped in two ways:
+# - Cancelling: the executors check a CancelToken between nodes. Once it is cancelled, no new node is started, the
+#   nodes already running finish, and the execution raises Cancelled. The nodes that didn't run keep their status, so
+#   the next execution picks up where this one stopped.
+# - Timing out: a node that runs longer than its timeout (Node.timeout, or the execution's node_timeout) fails with
+#   NodeTimeout, and the nodes downstream of it are skipped like for any other failure.
+#
+# Python threads can't be killed. A node that implements evaluate() runs it on a thread of its own, which is abandoned
+# when it times out: the execution goes on without it, and the outputs it returns late are dropped. The node can't run
+# again until that thread is done. Nodes that override compute() write their pins themselves, so they run on the
+# execution's thread and only fail once they return late. Long running computes should call check() regularly, which
+# raises as soon as the execution is cancelled or the node's time is up, so they stop promptly instead.
+
+
+class Cancelled(Exception):
+    """Raised by an execution that was cancelled, and by check() inside the nodes it runs."""
+
+    def __init__(self) -> None:
+        super().__init__("The execution was cancelled")
+
+
+class NodeTimeout(Exception):
+    """The error of a node that ran longer than its timeout."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        super().__init__(f"The node took longer than {timeout:g} seconds")
+
+
+class CancelToken:
+    """Lets an execution be cancelled from another thread, e.g. by the editor's Cancel button."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """Raises Cancelled if the token was cancelled."""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+# The token of the execution running the current node, and the node's timeout and deadline. See node_scope
+_Scope = Tuple[Optional[CancelToken], Optional[float], Optional[float]]
+_current: contextvars.ContextVar[_Scope] = contextvars.ContextVar(
+    "node_editor_cancellation", default=(None, None, None)
+)
+
+
+@contextlib.contextmanager
+def node_scope(cancel: Optional[CancelToken], timeout: Optional[float]) -> Iterator[None]:
+    """Makes check() see an execution's token and the timeout of the node running in the body of the with statement."""
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    token = _current.set((cancel, timeout, deadline))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def check() -> None:
+    """
+    Raises Cancelled if the execution running the current node was cancelled, or NodeTimeout if the node ran out of
+    time. Call me from long running computes. Does nothing outside of an execution.
+    """
+    cancel, timeout, deadline = _current.get()
+    if cancel is not None:
+        cancel.check()
+    if deadline is not None and timeout is not None and time.monotonic() > deadline:
+        raise NodeTimeout(timeout)
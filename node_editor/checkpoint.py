@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from node_editor import disk_cache
+from node_editor import memo
+from node_editor import streaming
+from node_editor.cancellation import CancelToken
+from node_editor.common import Node_Status
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.node import Node
+
+# A checkpointed execution saves the outputs of every node as soon as it finishes, so a run that fails or is
+# interrupted can be resumed: the nodes that finished are restored from the checkpoint and only the failed node and
+# what comes after it run again.
+#
+# A checkpoint is a folder with:
+# - manifest.json: the graph's key, and whether the run finished,
+# - journal.jsonl: one line per node that finished or failed, in the order they did, which records how far the run
+#   got and where a resumed run picks up. It is dropped when the graph changed since,
+# - entries/: the outputs of every finished node, in the format of node_editor.disk_cache.
+#
+# Entries are keyed by the lineage of a node: its class, the source of its module, its widget state and unconnected
+# input values, and the keys of the nodes feeding it. Changing a node's settings or code before resuming changes its
+# key and the keys of everything downstream, so only what is still valid gets restored.
+
+MANIFEST = "manifest.json"
+JOURNAL = "journal.jsonl"
+ENTRIES = "entries"
+
+
+def lineage_keys(plan: ExecutionPlan) -> List[Optional[str]]:
+    """
+    Returns the checkpoint key of every node of the plan, by position. Nodes whose outputs can't be checkpointed, and
+    the nodes downstream of them, get None.
+    """
+    position = {id(node): i for i, node in enumerate(plan.nodes)}
+    keys: List[Optional[str]] = [None] * len(plan.nodes)
+    for node_index in plan.schedule.order:
+        node = plan.nodes[node_index]
+        source = disk_cache.source_hash(type(node))
+        bound = {id(input_pin) for input_pin, _ in plan.bindings[node_index]}
+        own_inputs = [
+            (pin.name, getattr(pin, "value", None))
+            for pin in node._pins
+            if not pin.is_output and not pin.execution and id(pin) not in bound and hasattr(pin, "value")
+        ]
+        state = memo.fingerprint((node.get_widget_state(), own_inputs))
+        if source is None or state is None or node.streaming:
+            continue
+
+        upstream = []
+        for input_pin, output_pin in plan.bindings[node_index]:
+            upstream_key = keys[position[id(output_pin.node)]]
+            if upstream_key is None:
+                break
+            upstream.append(f"{input_pin.name}={upstream_key}:{output_pin.name}")
+        else:
+            name = f"{type(node).__module__}.{type(node).__qualname__}"
+            lineage = "\0".join([name, source, state] + sorted(upstream))
+            keys[node_index] = hashlib.blake2b(lineage.encode(), digest_size=20).hexdigest()
+    return keys
+
+
+class Checkpoint:
+    """
+    The checkpoint of an execution, stored in a folder.
+
+    Attributes:
+        path (str): The folder of the checkpoint.
+        restored (List[Node]): The nodes restored by the last call to restore().
+        failed (List[Node]): The nodes that failed since begin() was called.
+        resumed_from (Dict[str, str]): The nodes that failed in the run being resumed and didn't finish since, by
+            index, with their error. Set by begin().
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.restored: List[Node] = []
+        self.failed: List[Node] = []
+        self.resumed_from: Dict[str, str] = {}
+        self._plan: Optional[ExecutionPlan] = None
+        self._keys: Dict[int, str] = {}  # By node id
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, ENTRIES, key)
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.path, MANIFEST)) as f:
+                manifest: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest
+
+    def read_journal(self) -> List[Dict[str, Any]]:
+        """Returns the nodes that finished or failed during the checkpointed run, in order."""
+        records = []
+        try:
+            with open(os.path.join(self.path, JOURNAL)) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break  # The line being written when the run was killed
+        except OSError:
+            pass
+        return records
+
+    def _get_plan(self) -> ExecutionPlan:
+        if self._plan is None:
+            raise RuntimeError("The checkpoint wasn't started with begin()")
+        return self._plan
+
+    def _graph_key(self) -> str:
+        # Changes whenever a node is added, removed, reconnected or edited, since that changes the lineage keys
+        keys = sorted(self._keys.values())
+        return hashlib.blake2b("\0".join(keys).encode(), digest_size=20).hexdigest()
+
+    def _write_manifest(self, finished: bool) -> None:
+        manifest = {"graph": self._graph_key(), "finished": finished}
+        disk_cache.write_atomic(os.path.join(self.path, MANIFEST), json.dumps(manifest, indent=4).encode())
+
+    def begin(self, plan: ExecutionPlan, resume: bool = True) -> None:
+        """
+        Starts checkpointing an execution of the plan.
+
+        The entries that don't belong to the plan anymore are deleted, and so is the journal if the graph changed.
+        Without `resume`, or if the previous run finished, the checkpoint starts over empty.
+        """
+        self._plan = plan
+        self._keys = {id(node): key for node, key in zip(plan.nodes, lineage_keys(plan)) if key is not None}
+        self.failed = []
+        self.resumed_from = {}
+
+        manifest = self.read_manifest()
+        if not resume or (manifest is not None and manifest.get("finished")):
+            shutil.rmtree(self.path, ignore_errors=True)
+
+        entries = os.path.join(self.path, ENTRIES)
+        os.makedirs(entries, exist_ok=True)
+        current = set(self._keys.values())
+        for entry in os.scandir(entries):
+            if entry.name not in current:
+                disk_cache.remove_file(entry.path)
+
+        # The journal only describes the run being resumed, the entries are what gets restored
+        if not resume or manifest is None or manifest.get("graph") != self._graph_key():
+            disk_cache.remove_file(os.path.join(self.path, JOURNAL))
+        for record in self.read_journal():
+            if "error" in record:
+                self.resumed_from[record["node"]] = record["error"]
+            else:
+                self.resumed_from.pop(record["node"], None)
+        self._write_manifest(finished=False)
+
+    def restore(self) -> List[Node]:
+        """
+        Restores the outputs of the nodes that finished in the checkpoint, and sets them CLEAN. The other nodes are
+        set DIRTY so an execution with `only_dirty` computes exactly them. A node is only restored if all of its
+        upstream nodes were too, since otherwise it would have to run again anyway.
+        """
+        plan = self._get_plan()
+        done = [False] * len(plan.nodes)
+        self.restored = []
+        for node_index in plan.schedule.order:
+            node = plan.nodes[node_index]
+            key = self._keys.get(id(node))
+            outputs = None
+            if key is not None and all(done[i] for i in plan.schedule.predecessors[node_index]):
+                try:
+                    with open(self._entry_path(key), "rb") as f:
+                        outputs = disk_cache.decode_outputs(f.read())
+                except OSError:
+                    pass
+            if outputs is None:
+                node.set_status(Node_Status.DIRTY)
+                continue
+
+            node.apply_outputs(outputs)
+            node.execute_outputs()
+            node.set_status(Node_Status.CLEAN)
+            done[node_index] = True
+            self.restored.append(node)
+        return self.restored
+
+    def node_finished(self, node: Node, error: Optional[Exception]) -> None:
+        """Saves the outputs of a node that finished and records it in the journal."""
+        key = self._keys.get(id(node))
+        if key is None:
+            return
+
+        record: Dict[str, Any] = {"node": str(node.index), "key": key}
+        if error is not None:
+            self.failed.append(node)
+            record["error"] = f"{type(error).__name__}: {error}"
+        else:
+            outputs = {pin.name: pin.value for pin in node._pins if pin.is_output and hasattr(pin, "value")}
+            data = None
+            if not any(streaming.is_stream(value) for value in outputs.values()):
+                data = disk_cache.encode_outputs(outputs)
+            record["saved"] = data is not None and disk_cache.write_atomic(self._entry_path(key), data)
+
+        with open(os.path.join(self.path, JOURNAL), "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def end(self, interrupted: bool = False) -> None:
+        """Marks the run finished if no node failed and it wasn't interrupted, so the next run starts over."""
+        self._write_manifest(finished=not self.failed and not interrupted)
+
+
+_active: Optional[Checkpoint] = None
+
+
+def node_finished(node: Node, error: Optional[Exception]) -> None:
+    if _active is not None:
+        _active.node_finished(node, error)
+
+
+def execute_checkpointed(
+    plan: ExecutionPlan,
+    path: str,
+    resume: bool = True,
+    mode: str = "serial",
+    max_workers: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> Checkpoint:
+    """
+    Executes a plan, saving the outputs of every node to a checkpoint folder as soon as it finishes.
+
+    If a previous run with the same checkpoint failed or was interrupted, it is resumed: the nodes that finished are
+    restored from the checkpoint instead of being computed again. Nodes downstream of a node that fails are not
+    executed, so the next run resumes from the failed node.
+
+    Args:
+        plan: The compiled graph.
+        path: The checkpoint folder. It is created if needed.
+        resume: Resume the previous run, if it didn't finish. Otherwise the checkpoint starts over.
+        mode, max_workers, release_values, cancel, node_timeout: See execute_plan. A cancelled run is resumed like a
+            failed one.
+
+    Returns:
+        The checkpoint, with the nodes that were restored and the nodes that failed.
+    """
+    from node_editor.compute_graph import execute_plan
+
+    global _active
+    checkpoint = Checkpoint(path)
+    checkpoint.begin(plan, resume=resume)
+    restored = checkpoint.restore()
+    if restored:
+        print(f"=== Resuming from checkpoint: {len(restored)} of {len(plan.nodes)} nodes restored ===")
+    for index, error in checkpoint.resumed_from.items():
+        print(f"=== Node {index} failed in the previous run ({error}), running it again ===")
+
+    _active = checkpoint
+    interrupted = True
+    try:
+        execute_plan(
+            plan,
+            only_dirty=True,
+            mode=mode,
+            max_workers=max_workers,
+            release_values=release_values,
+            cancel=cancel,
+            node_timeout=node_timeout,
+        )
+        interrupted = False
+    finally:
+        _active = None
+        checkpoint.end(interrupted)
+    return checkpoint
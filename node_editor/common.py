@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from enum import Enum
 
 
@@ -7,3 +8,13 @@ class Node_Status(Enum):
     CLEAN = 1
     DIRTY = 2
     ERROR = 3
+
+
+def is_headless() -> bool:
+    """
+    Returns True when running without the editor GUI.
+
+    Set the NODE_EDITOR_HEADLESS environment variable before importing node_editor.node to make Node, Pin and
+    Connection use the Qt-free stand-ins from node_editor.headless.
+    """
+    return os.environ.get("NODE_EDITOR_HEADLESS", "") not in ("", "0")
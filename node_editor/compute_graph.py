@@ -1,77 +1,431 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TYPE_CHECKING
 
-from node_editor.connection import Connection
-from node_editor.node import Node
+from node_editor import async_runner
+from node_editor import executors
+from node_editor import process_pool
+from node_editor import profiler
+from node_editor.cancellation import CancelToken
+from node_editor.common import Node_Status
 
+if TYPE_CHECKING:
+    from node_editor.connection import Connection
+    from node_editor.node import Node
+    from node_editor.pin import Pin
 
-def topologicalSortUtil(v: int, adj: List[List[int]], visited: List[bool], stack: List[int]) -> None:
-    # Mark the current node as visited
-    visited[v] = True
 
-    # Recur for all adjacent vertices
-    for i in adj[v]:
-        if not visited[i]:
-            topologicalSortUtil(i, adj, visited, stack)
+class CycleError(Exception):
+    """Raised when a graph can't be scheduled because some of its nodes form a cycle.
 
-    # Push current vertex to stack which stores the result
-    stack.append(v)
+    Attributes:
+        cycle (list): The nodes (or node indexes) that are part of a cycle.
+    """
+
+    def __init__(self, cycle: Sequence[Any]) -> None:
+        self.cycle: List[Any] = list(cycle)
+        names = ", ".join(_describe(item) for item in self.cycle)
+        super().__init__(f"Graph contains a cycle through: {names}")
+
+
+def _describe(item: Any) -> str:
+    if isinstance(item, int):
+        return str(item)
+    return f"{item.__class__.__name__} {getattr(item, 'index', '?')}"
+
+
+class Schedule:
+    """
+    The execution schedule of a graph, built iteratively with Kahn's algorithm in O(V+E).
+
+    Nodes are referred to by their position in the node list the schedule was built from. The schedule can be
+    kept and reused for as long as the structure of the graph doesn't change.
+
+    Attributes:
+        num_nodes (int): The number of nodes in the graph.
+        successors (List[List[int]]): For each node, the nodes that depend on it (one entry per edge).
+        predecessors (List[List[int]]): For each node, the nodes it depends on (one entry per edge).
+        levels (List[List[int]]): The nodes grouped by topological level. Nodes on the same level don't depend on
+            each other.
+        order (List[int]): A topological order of the nodes. Empty if the graph has a cycle.
+        cycle (List[int]): The nodes that form (or sit between) cycles. Empty if the graph is acyclic.
+    """
+
+    def __init__(self, num_nodes: int, edges: Iterable[Tuple[int, int]]) -> None:
+        self.num_nodes = num_nodes
+        self.successors: List[List[int]] = [[] for _ in range(num_nodes)]
+        self.predecessors: List[List[int]] = [[] for _ in range(num_nodes)]
+        for src, dst in edges:
+            self.successors[src].append(dst)
+            self.predecessors[dst].append(src)
+
+        self.levels: List[List[int]] = []
+        self.order: List[int] = []
+        self.cycle: List[int] = []
+        self._sort()
+
+    @classmethod
+    def from_graph(cls, nodes: Sequence[Node], connections: Iterable[Connection]) -> Schedule:
+        """
+        Builds the schedule for the given nodes and the connections between them.
+
+        Connections with a loose end, or to nodes that aren't in `nodes`, are ignored.
+        """
+        position = {id(node): i for i, node in enumerate(nodes)}
+        edges = []
+        for connection in connections:
+            src, dst = connection.nodes()
+            if src is None or dst is None:
+                continue
+            try:
+                edges.append((position[id(src)], position[id(dst)]))
+            except KeyError:
+                continue
+        return cls(len(nodes), edges)
+
+    def is_acyclic(self) -> bool:
+        return not self.cycle
+
+    def in_degrees(self) -> List[int]:
+        """Returns a fresh list with the number of incoming edges of each node."""
+        return [len(preds) for preds in self.predecessors]
+
+    def _sort(self) -> None:
+        in_degree = self.in_degrees()
+
+        # Peel the graph one level at a time, starting from the nodes without inputs
+        order: List[int] = []
+        frontier = [v for v in range(self.num_nodes) if in_degree[v] == 0]
+        while frontier:
+            self.levels.append(frontier)
+            order.extend(frontier)
+            next_frontier = []
+            for v in frontier:
+                for w in self.successors[v]:
+                    in_degree[w] -= 1
+                    if in_degree[w] == 0:
+                        next_frontier.append(w)
+            frontier = next_frontier
+
+        if len(order) == self.num_nodes:
+            self.order = order
+            return
+
+        # Whatever is left is either on a cycle or downstream of one. Peel off the nodes that don't lead back into
+        # the remainder so only the nodes forming the cycles are reported.
+        remaining = [in_degree[v] > 0 for v in range(self.num_nodes)]
+        out_degree = [0] * self.num_nodes
+        for v in range(self.num_nodes):
+            if remaining[v]:
+                out_degree[v] = sum(1 for w in self.successors[v] if remaining[w])
+
+        stack = [v for v in range(self.num_nodes) if remaining[v] and out_degree[v] == 0]
+        while stack:
+            v = stack.pop()
+            remaining[v] = False
+            for u in self.predecessors[v]:
+                if remaining[u]:
+                    out_degree[u] -= 1
+                    if out_degree[u] == 0:
+                        stack.append(u)
+
+        self.levels = []
+        self.cycle = [v for v in range(self.num_nodes) if remaining[v]]
 
 
 # Function to perform Topological Sort
 def topologicalSort(adj: List[List[int]], num_nodes: int) -> List[int]:
-    # Stack to store the result
-    stack: List[int] = []
+    schedule = Schedule(num_nodes, ((src, dst) for src in range(num_nodes) for dst in adj[src]))
+    if schedule.cycle:
+        raise CycleError(schedule.cycle)
+    return schedule.order
+
+
+EXECUTION_MODES = ("serial", "threaded", "process", "async")
+
 
-    visited = [False] * num_nodes
+def schedule_graph(nodes: Sequence[Node], connections: Iterable[Connection]) -> Schedule:
+    """Builds the schedule of a graph, raising CycleError if it has a cycle."""
+    schedule = Schedule.from_graph(nodes, connections)
+    if schedule.cycle:
+        raise CycleError([nodes[i] for i in schedule.cycle])
+    return schedule
 
-    # Call the recursive helper function to store
-    # Topological Sort starting from all vertices one by
-    # one
-    for i in range(num_nodes):
-        if not visited[i]:
-            topologicalSortUtil(i, adj, visited, stack)
 
-    # Print contents of stack
-    print("Topological sorting of the graph:", end=" ")
+class ExecutionPlan:
+    """
+    A graph compiled for execution.
 
-    topological_order = []
-    while stack:
-        # print(stack.pop(), end=" ")
-        topological_order.append(stack.pop())
+    Building the plan does all of the graph analysis up front: the nodes are put in a flat list, the graph is
+    scheduled and each input pin is bound to the output pin it pulls its value from. The plan stays valid until the
+    structure of the graph changes (a node or a connection is added or removed), so repeated executions only have to
+    move values and call compute.
 
-    return topological_order
+    Attributes:
+        nodes (List[Node]): The nodes of the graph. Nodes are referred to by their position in this list.
+        schedule (Schedule): The execution schedule of the nodes.
+        bindings (List[List[Tuple[Pin, Pin]]]): For each node, its (input pin, output pin) pairs.
+    """
 
+    def __init__(self, nodes: Sequence[Node], connections: Iterable[Connection]) -> None:
+        """
+        Raises:
+            CycleError: If the graph contains a cycle.
+        """
+        connections = list(connections)
+        self.nodes: List[Node] = list(nodes)
+        self.schedule = schedule_graph(self.nodes, connections)
+        self.bindings: List[List[Tuple[Pin, Pin]]] = [[] for _ in self.nodes]
 
-def compute_dag_nodes(nodes: List[Node], connections: List[Connection]) -> None:
+        position = {id(node): i for i, node in enumerate(self.nodes)}
+        for connection in connections:
+            start_pin, end_pin = connection.start_pin, connection.end_pin
+            if start_pin is None or end_pin is None:
+                continue
+            input_pin, output_pin = (end_pin, start_pin) if start_pin.is_output else (start_pin, end_pin)
+            node_index = position.get(id(input_pin.node))
+            if node_index is not None:
+                self.bindings[node_index].append((input_pin, output_pin))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+def execute_plan(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    mode: str = "serial",
+    max_workers: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes a compiled graph in topological order.
+
+    With `only_dirty` set, nodes that are CLEAN are skipped unless one of their upstream nodes ran during this
+    execution. Nodes that run are set to CLEAN, or to ERROR if they raise.
+
+    Args:
+        plan: The compiled graph.
+        only_dirty: Skip CLEAN nodes whose upstream nodes didn't run.
+        mode: "serial" runs the nodes one at a time on the calling thread. "threaded" runs independent nodes
+            concurrently on a thread pool. "process" runs process safe nodes in worker processes. "async" runs the
+            graph on a new event loop, awaiting `async def` computes concurrently.
+        max_workers: The number of workers used by the "threaded" and "process" modes, or the maximum number of
+            nodes in flight for the "async" mode.
+        release_values: Drop every intermediate value as soon as the last node reading it is done, so the peak
+            memory depends on the width of the graph rather than its size. The values of the outputs that feed no
+            node and of retained pins are kept. See node_editor.liveness.
+        cancel: Stops the execution between nodes once it is cancelled, e.g. from another thread. See
+            node_editor.cancellation.
+        node_timeout: The number of seconds after which a node fails with NodeTimeout, unless its class sets a
+            timeout of its own.
+
+    Raises:
+        Cancelled: If the execution was cancelled.
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    if mode == "async":
+        asyncio.run(
+            execute_plan_async(
+                plan,
+                only_dirty=only_dirty,
+                max_in_flight=max_workers,
+                release_values=release_values,
+                cancel=cancel,
+                node_timeout=node_timeout,
+            )
+        )
+        return
+
+    print("=== Computing DAG Nodes ===")
+    profiler.start_run()
+
+    if mode == "threaded":
+        executors.execute_threaded(
+            plan,
+            only_dirty=only_dirty,
+            max_workers=max_workers,
+            release_values=release_values,
+            cancel=cancel,
+            node_timeout=node_timeout,
+        )
+    elif mode == "process":
+        process_pool.execute_processes(
+            plan,
+            only_dirty=only_dirty,
+            max_workers=max_workers,
+            release_values=release_values,
+            cancel=cancel,
+            node_timeout=node_timeout,
+        )
+    else:
+        executors.execute_serial(
+            plan, only_dirty=only_dirty, release_values=release_values, cancel=cancel, node_timeout=node_timeout
+        )
+
+
+async def execute_plan_async(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    max_in_flight: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes a compiled graph on the running event loop. See execute_plan and
+    node_editor.async_runner.execute_async.
+    """
     print("=== Computing DAG Nodes ===")
+    profiler.start_run()
+
+    await async_runner.execute_async(
+        plan,
+        only_dirty=only_dirty,
+        max_in_flight=max_in_flight,
+        release_values=release_values,
+        cancel=cancel,
+        node_timeout=node_timeout,
+    )
+
+
+def compute_dag_nodes(
+    nodes: List[Node],
+    connections: List[Connection],
+    only_dirty: bool = True,
+    mode: str = "serial",
+    max_workers: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Compiles the graph and executes it. See execute_plan.
+
+    Raises:
+        CycleError: If the graph contains a cycle.
+        Cancelled: If the execution was cancelled.
+    """
+    execute_plan(
+        ExecutionPlan(nodes, connections),
+        only_dirty=only_dirty,
+        mode=mode,
+        max_workers=max_workers,
+        release_values=release_values,
+        cancel=cancel,
+        node_timeout=node_timeout,
+    )
+
+
+async def compute_dag_nodes_async(
+    nodes: List[Node],
+    connections: List[Connection],
+    only_dirty: bool = True,
+    max_in_flight: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Compiles the graph and executes it on the running event loop. See execute_plan_async.
+
+    Raises:
+        CycleError: If the graph contains a cycle.
+        Cancelled: If the execution was cancelled.
+    """
+    await execute_plan_async(
+        ExecutionPlan(nodes, connections),
+        only_dirty=only_dirty,
+        max_in_flight=max_in_flight,
+        release_values=release_values,
+        cancel=cancel,
+        node_timeout=node_timeout,
+    )
+
+
+def upstream_order(node: Node, stop_at: Optional[Callable[[Node], bool]] = None) -> List[Node]:
+    """
+    Returns the node and all of its ancestors in topological order, the node itself last.
+
+    Args:
+        node: The node to start from.
+        stop_at: Ancestors for which this returns True are left out, along with their own ancestors.
 
-    num_nodes = len(nodes)
+    Raises:
+        CycleError: If the ancestors of the node contain a cycle.
+    """
+    order: List[Node] = []
+    done = set()
+    on_path = {id(node)}
+    path = [node]
+    # The upstream nodes still to visit for each node on the DFS path
+    pending = [iter(node.get_upstream_nodes())]
+    while pending:
+        upstream = next(pending[-1], None)
+        if upstream is None:
+            finished = path.pop()
+            pending.pop()
+            on_path.discard(id(finished))
+            done.add(id(finished))
+            order.append(finished)
+            continue
+        if id(upstream) in done or (stop_at is not None and stop_at(upstream)):
+            continue
+        if id(upstream) in on_path:
+            start = next(i for i, item in enumerate(path) if item is upstream)
+            raise CycleError(path[start:])
+        on_path.add(id(upstream))
+        path.append(upstream)
+        pending.append(iter(upstream.get_upstream_nodes()))
+    return order
 
-    # Build adjacency list from connection pairs
-    edges = []
-    for connection in connections:
-        node_pair = [int(node.index) for node in connection.nodes() if node is not None]
-        if len(node_pair) == 2:
-            edges.append(node_pair)
 
-    adjacency: List[List[int]] = [[] for _ in range(num_nodes)]
-    for src, dst in edges:
-        adjacency[src].append(dst)
+def execute_upstream(
+    node: Node,
+    stop_at: Optional[Callable[[Node], bool]] = None,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> List[Node]:
+    """
+    Executes only what is needed to bring a node up to date: the node and its ancestors.
 
-    print("Adjacency List:")
-    for idx, adj in enumerate(adjacency):
-        print(f"{idx}: {adj}")
+    Ancestors that are CLEAN are reused as they are, unless one of their own upstream nodes had to run. Nodes that
+    aren't upstream of the node are never touched, so previewing one node of a large graph costs its ancestors only.
 
-    topological_order = topologicalSort(adjacency, num_nodes)
+    Args:
+        node: The node to bring up to date.
+        stop_at: Ancestors for which this returns True aren't executed. Their outputs are used as they are.
+        cancel: See execute_plan.
+        node_timeout: See execute_plan.
 
-    print("\nTopological Order:", topological_order)
+    Returns:
+        The nodes that were executed, in order.
 
-    for node_index in topological_order:
-        node = nodes[node_index]
-        try:
-            print(f"\n--- Executing Node {node_index} ({node.__class__.__name__}) ---")
-            node.execute()
-        except Exception as e:
-            print(f"Error executing node {node_index}: {e}")
+    Raises:
+        CycleError: If the ancestors of the node contain a cycle.
+        Cancelled: If `cancel` was cancelled.
+    """
+    nodes = upstream_order(node, stop_at)
+    executed = set()
+    for item in nodes:
+        upstream_ran = any(id(upstream) in executed for upstream in item.get_upstream_nodes())
+        if item.status == Node_Status.CLEAN and not item.streaming and not upstream_ran:
+            continue
+        if cancel is not None:
+            cancel.check()
+        executed.add(id(item))
+        error = executors.run_node(item, timeout=executors.timeout_of(item, node_timeout), cancel=cancel)
+        executors.finish_node(item, error)
+    return [item for item in nodes if id(item) in executed]
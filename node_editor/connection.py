@@ -1,41 +1,67 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import Optional
 from typing import Tuple
+from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QPointF
-from PySide6.QtWidgets import QGraphicsScene
-
-from node_editor.gui.connection_graphics import Connection_Graphics
+from node_editor.common import is_headless
 from node_editor.node import Node
 from node_editor.pin import Pin
 
+if not is_headless():
+    from node_editor.gui.connection_graphics import Connection_Graphics
+else:
+    from node_editor.headless import Connection_Graphics  # type: ignore
+
+if TYPE_CHECKING:
+    from PySide6.QtCore import QPointF
+    from PySide6.QtWidgets import QGraphicsScene
+
 
 class Connection(Connection_Graphics):
-    def __init__(self, parent: Optional[Connection_Graphics]) -> None:
-        super().__init__(parent)
+    def __init__(self, parent: Optional[Any]) -> None:
+        super().__init__(parent)  # Sets up start_pos and end_pos
         self.start_pin: Optional[Pin] = None
         self.end_pin: Optional[Pin] = None
-        self.start_pos: QPointF = QPointF()
-        self.end_pos: QPointF = QPointF()
+        self.start_pos: QPointF
+        self.end_pos: QPointF
 
     def delete(self) -> None:
         for pin in (self.start_pin, self.end_pin):
             if pin is not None:
-                pin.connection = None
+                pin.remove_connection(self)
+                self._mark_input_dirty(pin)
         self.start_pin = None
         self.end_pin = None
+        self._notify_scene()
         scene = self.scene()
         if scene is not None:
             scene.removeItem(self)
 
     def set_start_pin(self, pin: Pin) -> None:
         self.start_pin = pin
-        pin.connection = self
+        pin.add_connection(self)
+        self._mark_input_dirty(pin)
+        self._notify_scene()
 
     def set_end_pin(self, pin: Pin) -> None:
         self.end_pin = pin
-        pin.connection = self
+        pin.add_connection(self)
+        self._mark_input_dirty(pin)
+        self._notify_scene()
+
+    def _notify_scene(self) -> None:
+        # The scene's graph model and compiled execution plan depend on which pins are connected
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "connection_changed"):
+            scene.connection_changed(self)
+
+    @staticmethod
+    def _mark_input_dirty(pin: Pin) -> None:
+        # Only the node on the receiving end of a connection is affected by it changing
+        if not pin.is_output and pin.node is not None:
+            pin.node.mark_dirty()
 
     def nodes(self) -> Tuple[Optional[Node], Optional[Node]]:
         return (
@@ -45,7 +71,9 @@ class Connection(Connection_Graphics):
 
     def update_start_and_end_pos(self) -> None:
         if self.start_pin is not None and not self.start_pin.is_output:
+            # Wires dragged from an input pin start there, but connections always go from an output to an input
             self.start_pin, self.end_pin = self.end_pin, self.start_pin
+            self._notify_scene()
 
         if self.start_pin is not None:
             self.start_pos = self.start_pin.scenePos()
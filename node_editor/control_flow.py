@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from node_editor.compute_graph import execute_upstream
+from node_editor.executors import finish_node
+from node_editor.executors import run_node
+from node_editor.executors import timeout_of
+
+if TYPE_CHECKING:
+    from node_editor.cancellation import CancelToken
+    from node_editor.node import Node
+
+# Execution pins ("Ex In"/"Ex Out") describe the order in which things happen, as opposed to data pins which
+# describe where values come from. Firing a trigger node (e.g. a button) runs it, then follows its exec outputs:
+#
+# - Exec nodes, the nodes with an exec input, only run when an exec connection reaches them. Nodes that aren't
+#   reachable from the trigger never compute.
+# - Pure nodes, the nodes without an exec input, are computed on demand when an exec node needs their data, and are
+#   reused while they stay CLEAN.
+# - Sequence: an exec node fires its exec outputs in the order the pins were added, running the whole chain of
+#   each one before moving on to the next.
+# - Branch: an exec node can pick the exec outputs to fire from its compute with Node.select_exec_outputs.
+
+DEFAULT_MAX_STEPS = 1_000_000
+
+
+def is_exec_node(node: Node) -> bool:
+    """Returns True if the node has an exec input, so it only runs when the control flow reaches it."""
+    return any(pin.execution and not pin.is_output for pin in node._pins)
+
+
+def pull_inputs(node: Node, cancel: Optional[CancelToken] = None, node_timeout: Optional[float] = None) -> None:
+    """
+    Brings the data inputs of an exec node up to date by computing the pure nodes they depend on.
+
+    Exec nodes upstream are never run from here: their outputs hold whatever they computed when they last fired.
+    See run_exec for `cancel` and `node_timeout`.
+    """
+    for pin in node._pins:
+        if pin.is_output or pin.execution or not pin.connection:
+            continue
+        other_pin = pin.connection.get_other_pin(pin)
+        if other_pin and other_pin.node and not is_exec_node(other_pin.node):
+            execute_upstream(other_pin.node, stop_at=is_exec_node, cancel=cancel, node_timeout=node_timeout)
+
+
+def fired_exec_nodes(node: Node) -> List[Node]:
+    """Returns the nodes connected to the exec outputs the node fires, in firing order."""
+    outputs = [pin for pin in node._pins if pin.is_output and pin.execution]
+    if node.exec_selection is not None:
+        by_name = {pin.name: pin for pin in outputs}
+        outputs = [by_name[name] for name in node.exec_selection if name in by_name]
+
+    nodes = []
+    for pin in outputs:
+        # An exec output connected to several nodes fires them in the order they were connected
+        for other_pin in pin.get_other_pins():
+            if other_pin.node:
+                nodes.append(other_pin.node)
+    return nodes
+
+
+def run_exec(
+    trigger: Node,
+    max_steps: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> List[Node]:
+    """
+    Fires a trigger node and runs everything its exec outputs lead to.
+
+    Each exec node pulls its data inputs, computes, then fires its exec outputs depth first. A node that raises is
+    set to ERROR and the chain stops there.
+
+    Args:
+        trigger: The node to start from, usually a node with exec outputs only such as a button.
+        max_steps: The maximum number of exec nodes to run, to stop exec loops. Defaults to DEFAULT_MAX_STEPS.
+        cancel: Stops the chain between nodes once it is cancelled, e.g. by the editor's Cancel button.
+        node_timeout: The number of seconds after which a node fails with NodeTimeout, unless its class sets a
+            timeout of its own.
+
+    Returns:
+        The exec nodes that ran, in order. A node appears once for every time it was reached.
+
+    Raises:
+        RuntimeError: If more than `max_steps` nodes were run.
+        Cancelled: If `cancel` was cancelled.
+    """
+    limit = max_steps or DEFAULT_MAX_STEPS
+    print(f"=== Firing {trigger.__class__.__name__} {trigger.index} ===")
+
+    ran: List[Node] = []
+    stack = [trigger]
+    while stack:
+        node = stack.pop()
+        if cancel is not None:
+            cancel.check()
+        if len(ran) >= limit:
+            raise RuntimeError(f"Exec chain ran more than {limit} nodes, it probably loops")
+        ran.append(node)
+
+        node.exec_selection = None
+        try:
+            pull_inputs(node, cancel, node_timeout)
+        except Exception as e:
+            print(f"Error pulling the inputs of node {node.index}: {e}")
+            finish_node(node, e)
+            continue
+
+        error = run_node(node, timeout=timeout_of(node, node_timeout), cancel=cancel)
+        finish_node(node, error)
+        if error is None:
+            # Reversed so the first exec output runs first
+            stack.extend(reversed(fired_exec_nodes(node)))
+    if cancel is not None:
+        cancel.check()
+
+    return ran
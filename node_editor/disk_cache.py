@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from node_editor.node import Node
+
+# The memo cache (see node_editor.memo) only lives as long as the editor. The disk cache keeps the outputs of memoized
+# nodes across sessions, so reopening a project and executing it again reuses what was computed last time.
+#
+# Entries are content addressed: the key hashes the node class, the source of the module that defines it, and the
+# memo fingerprint of the node's inputs and widget state. Editing a *_node.py module changes the key of every node it
+# defines, so stale results are never read back; they just age out.
+#
+# Every entry is a single file, written to a temporary file first and then renamed over its final name, so readers
+# never see a partial entry. Entries start with a checksum of their contents, and an entry that doesn't match it
+# (e.g. after a crash or a full disk) is deleted and treated as a miss. The cache is bounded in size: when it grows
+# past max_bytes, the least recently used entries are deleted.
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# The folder of a project's cache, inside the project folder
+PROJECT_CACHE_DIR = ".node_cache"
+
+_MAGIC = b"NEDC1"
+_DIGEST_SIZE = 32
+# Eviction deletes entries until the cache is below this fraction of max_bytes, so it doesn't run on every write
+_LOW_WATER = 0.9
+# Temporary files older than this are left over from a crash and can be deleted
+_STALE_TMP_SECONDS = 3600
+
+
+class _Pickler(pickle.Pickler):
+    # Byte buffers are published as read-only memoryviews, which can't be pickled. They are stored as bytes
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, memoryview):
+            return bytes, (obj.tobytes(),)
+        return NotImplemented
+
+
+_source_hashes: Dict[type, Optional[str]] = {}
+
+
+def source_hash(node_class: type) -> Optional[str]:
+    """Returns a hash of the source file of the module defining a node class, or None if it can't be read."""
+    if node_class not in _source_hashes:
+        try:
+            with open(inspect.getfile(node_class), "rb") as f:
+                _source_hashes[node_class] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except (OSError, TypeError):
+            _source_hashes[node_class] = None
+    return _source_hashes[node_class]
+
+
+def entry_key(node_class: type, input_key: str) -> Optional[str]:
+    """Returns the cache key of a node class's outputs for a memo fingerprint of its inputs."""
+    source = source_hash(node_class)
+    if source is None:
+        return None
+    name = f"{node_class.__module__}.{node_class.__qualname__}"
+    return hashlib.blake2b(f"{name}\0{source}\0{input_key}".encode(), digest_size=20).hexdigest()
+
+
+class DiskCache:
+    """
+    A size bounded cache of node outputs stored as files in a folder.
+
+    Attributes:
+        path (str): The folder of the cache.
+        max_bytes (int): The maximum total size of the entries.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that didn't.
+        evictions (int): The number of entries deleted to stay within max_bytes.
+        corrupted (int): The number of entries deleted because they were damaged.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.corrupted = 0
+        self.total_bytes = 0
+        # The size and last use time of every entry, by key. Built from the folder on first use
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is not None:
+            return self._index
+
+        index: Dict[str, Tuple[int, float]] = {}
+        now = time.time()
+        for shard in os.scandir(self.path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.startswith(".tmp"):
+                    if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                        remove_file(entry.path)
+                    continue
+                index[entry.name] = (stat.st_size, stat.st_mtime)
+        self._index = index
+        self.total_bytes = sum(size for size, _ in index.values())
+        return index
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        outputs = decode_outputs(data)
+        with self._lock:
+            index = self._load_index()
+            if outputs is None:
+                self.corrupted += 1
+                self.misses += 1
+                self._drop(index, key)
+                return None
+            self.hits += 1
+            index[key] = (len(data), time.time())
+
+        # The modification time records the last use, so least recently used entries are evicted first, also by
+        # other sessions sharing the folder
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return outputs
+
+    def put(self, key: str, outputs: Dict[str, Any]) -> bool:
+        """Stores the outputs under a key. Returns False if they can't be pickled or don't fit in the cache."""
+        data = encode_outputs(outputs)
+        if data is None or len(data) > self.max_bytes or not write_atomic(self._entry_path(key), data):
+            return False
+
+        with self._lock:
+            index = self._load_index()
+            old = index.get(key)
+            if old is not None:
+                self.total_bytes -= old[0]
+            index[key] = (len(data), time.time())
+            self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict(index)
+        return True
+
+    def _evict(self, index: Dict[str, Tuple[int, float]]) -> None:
+        target = self.max_bytes * _LOW_WATER
+        for key in sorted(index, key=lambda key: index[key][1]):
+            if self.total_bytes <= target:
+                break
+            self._drop(index, key)
+            self.evictions += 1
+
+    def _drop(self, index: Dict[str, Tuple[int, float]], key: str) -> None:
+        entry = index.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[0]
+        remove_file(self._entry_path(key))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def clear(self) -> None:
+        with self._lock:
+            index = self._load_index()
+            for key in list(index):
+                self._drop(index, key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = len(self._load_index())
+        return {
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "corrupted": self.corrupted,
+        }
+
+
+def remove_file(path: str) -> None:
+    """Deletes a file if it exists."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_atomic(path: str, data: bytes) -> bool:
+    """
+    Writes a file so that readers see either its previous contents or the new ones, never a partial write.
+    Returns False if it couldn't be written.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp", dir=directory)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        remove_file(tmp_path)
+        return False
+    return True
+
+
+def encode_outputs(outputs: Dict[str, Any]) -> Optional[bytes]:
+    """Pickles a set of output values behind a checksum. Returns None if they can't be pickled."""
+    buffer = io.BytesIO()
+    try:
+        _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(outputs)
+    except Exception:
+        return None
+    payload = buffer.getvalue()
+    return _MAGIC + hashlib.blake2b(payload, digest_size=_DIGEST_SIZE).digest() + payload
+
+
+def decode_outputs(data: bytes) -> Optional[Dict[str, Any]]:
+    """Reads back the output values written by encode_outputs. Returns None if the data is damaged."""
+    start = len(_MAGIC)
+    header = start + _DIGEST_SIZE
+    if len(data) < header or not data.startswith(_MAGIC):
+        return None
+    payload = memoryview(data)[header:]
+    if hashlib.blake2b(payload, digest_size=_DIGEST_SIZE).digest() != data[start:header]:
+        return None
+    try:
+        outputs = pickle.loads(payload)
+    except Exception:
+        return None
+    return outputs if isinstance(outputs, dict) else None
+
+
+_active: Optional[DiskCache] = None
+
+
+def enable(path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> DiskCache:
+    """Starts persisting the outputs of memoized nodes to a folder. Returns the active cache."""
+    global _active
+    if _active is None or _active.path != path or _active.max_bytes != max_bytes:
+        _active = DiskCache(path, max_bytes)
+    return _active
+
+
+def disable() -> Optional[DiskCache]:
+    global _active
+    cache, _active = _active, None
+    return cache
+
+
+def get_cache() -> Optional[DiskCache]:
+    return _active
+
+
+def load(node: Node, input_key: str) -> Optional[Dict[str, Any]]:
+    """Returns the outputs stored for a node and a memo fingerprint of its inputs, if the disk cache is enabled."""
+    if _active is None or not node.memo_persist:
+        return None
+    key = entry_key(type(node), input_key)
+    return _active.get(key) if key is not None else None
+
+
+def save(node: Node, input_key: str, outputs: Dict[str, Any]) -> None:
+    """Stores the outputs of a node for a memo fingerprint of its inputs, if the disk cache is enabled."""
+    if _active is None or not node.memo_persist:
+        return
+    key = entry_key(type(node), input_key)
+    if key is not None:
+        _active.put(key, outputs)
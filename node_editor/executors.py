@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from node_editor import checkpoint
+from node_editor import memo
+from node_editor import profiler
+from node_editor.cancellation import Cancelled
+from node_editor.cancellation import CancelToken
+from node_editor.cancellation import node_scope
+from node_editor.cancellation import NodeTimeout
+from node_editor.common import Node_Status
+from node_editor.liveness import Liveness
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.compute_graph import Schedule
+    from node_editor.node import Node
+    from node_editor.pin import Pin
+
+
+def needs_execution(node_index: int, nodes: Sequence[Node], schedule: Schedule, executed: List[bool]) -> bool:
+    """
+    A node needs executing if it isn't CLEAN, if it produces streams (which can only be consumed once), or if one of
+    its upstream nodes ran during this execution.
+    """
+    node = nodes[node_index]
+    if node.status != Node_Status.CLEAN or node.streaming:
+        return True
+    return any(executed[i] for i in schedule.predecessors[node_index])
+
+
+def upstream_failed(node_index: int, nodes: Sequence[Node], schedule: Schedule, failed: List[bool]) -> bool:
+    """
+    Returns True if one of a node's upstream nodes failed during this execution, or was skipped because of a failure,
+    in which case the node is skipped too rather than computed from stale values. It is left DIRTY.
+    """
+    if not any(failed[i] for i in schedule.predecessors[node_index]):
+        return False
+    failed[node_index] = True
+    node = nodes[node_index]
+    print(f"Skipping node {node.index} ({node.__class__.__name__}): an upstream node failed")
+    node.set_status(Node_Status.DIRTY)
+    return True
+
+
+# Runs a function on the GUI thread and returns its result. Set by the editor when it executes graphs on a background
+# thread, so nodes with `main_thread_only` still run on the GUI thread. See set_main_thread
+MainThreadDispatcher = Callable[[Callable[[], Optional[Exception]]], Optional[Exception]]
+_main_thread: Optional[MainThreadDispatcher] = None
+
+
+def set_main_thread(dispatcher: Optional[MainThreadDispatcher]) -> None:
+    """Sets the function running nodes with `main_thread_only` on the GUI thread, None runs them on the caller's."""
+    global _main_thread
+    _main_thread = dispatcher
+
+
+def timeout_of(node: Node, node_timeout: Optional[float]) -> Optional[float]:
+    """Returns the timeout of a node: its class's, or else the execution's."""
+    return node.timeout if node.timeout is not None else node_timeout
+
+
+# The threads of the nodes that timed out and are still running, by node id. See run_node
+_abandoned: Dict[int, threading.Thread] = {}
+_abandoned_lock = threading.Lock()
+
+
+def computes_privately(node: Node) -> bool:
+    """
+    Returns True if a node computes its outputs with evaluate() and returns them rather than setting its pins, so
+    they can be computed away from the node and thrown away.
+    """
+    from node_editor.node import Node
+
+    return type(node).compute is Node.compute and type(node).evaluate is not Node.evaluate
+
+
+def run_node(
+    node: Node,
+    bindings: Optional[Sequence[Tuple[Pin, Pin]]] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Optional[Exception]:
+    """
+    Executes a single node. Returns the exception it raised, if any.
+
+    A node that runs longer than its timeout fails with NodeTimeout. When the node computes privately (see
+    computes_privately), evaluate() runs on a thread of its own that is abandoned when the time is up, and the outputs
+    are only set if it returned in time. Other nodes set their pins as they compute, so they run on the calling thread
+    and can only stop early by calling cancellation.check().
+    """
+
+    def execute() -> Optional[Exception]:
+        try:
+            print(f"\n--- Executing Node {node.index} ({node.__class__.__name__}) ---")
+            with node_scope(cancel, timeout):
+                node.execute(bindings)
+        except Exception as e:
+            print(f"Error executing node {node.index}: {e}")
+            return e
+        return None
+
+    if node.main_thread_only:
+        return _main_thread(execute) if _main_thread is not None else execute()
+    if timeout is None:
+        return execute()
+    if not computes_privately(node):
+        start = time.monotonic()
+        error = execute()
+        if error is None and time.monotonic() - start > timeout:
+            print(f"Node {node.index} ({node.__class__.__name__}) timed out after {timeout:g} seconds")
+            return NodeTimeout(timeout)
+        return error
+
+    with _abandoned_lock:
+        previous = _abandoned.get(id(node))
+        if previous is not None and not previous.is_alive():
+            del _abandoned[id(node)]
+            previous = None
+    if previous is not None:
+        error = RuntimeError(f"Node {node.index} is still running from an execution in which it timed out")
+        print(f"Error executing node {node.index}: {error}")
+        return error
+
+    try:
+        print(f"\n--- Executing Node {node.index} ({node.__class__.__name__}) ---")
+        with profiler.phase(node, "execute_inputs"):
+            node.execute_inputs(bindings)
+        key = memo.input_fingerprint(node) if node.memoize else None
+        if key is None or not node.restore_memoized(key):
+            with profiler.phase(node, "compute"):
+                outputs = _evaluate_with_timeout(node, timeout, cancel)
+            if outputs is None:
+                print(f"Node {node.index} ({node.__class__.__name__}) timed out after {timeout:g} seconds")
+                return NodeTimeout(timeout)
+            node.apply_outputs(outputs)
+            if key is not None:
+                node.store_memoized(key)
+        with profiler.phase(node, "execute_outputs"):
+            node.execute_outputs()
+    except Exception as e:
+        print(f"Error executing node {node.index}: {e}")
+        return e
+    return None
+
+
+def _evaluate_with_timeout(node: Node, timeout: float, cancel: Optional[CancelToken]) -> Optional[Dict[str, Any]]:
+    # Runs the node's evaluate() on a thread of its own. Returns its outputs, or None if it didn't return in time, in
+    # which case the thread is abandoned and its outputs are never set. Raises what evaluate() raised
+    inputs, widget_state = node.gather_inputs(), node.get_widget_state()
+    result: List[Dict[str, Any]] = []
+    errors: List[Exception] = []
+
+    def evaluate() -> None:
+        try:
+            with node_scope(cancel, timeout):
+                result.append(node.evaluate(inputs, widget_state))
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=evaluate, name=f"node-{node.index}", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        with _abandoned_lock:
+            _abandoned[id(node)] = thread
+        return None
+    if errors:
+        raise errors[0]
+    return result[0]
+
+
+def finish_node(node: Node, error: Optional[Exception]) -> None:
+    # Only ever called from the thread running the executor. Status lights are repainted on the GUI thread
+    if isinstance(error, Cancelled):
+        # The node stopped itself since the execution was cancelled, it runs again next time
+        node.set_status(Node_Status.DIRTY)
+        return
+    node.set_status(Node_Status.ERROR if error else Node_Status.CLEAN)
+    checkpoint.node_finished(node, error)
+
+
+def stop_if_cancelled(
+    cancel: Optional[CancelToken], ready: Deque[int], pending: Optional[Dict[Future[Any], Any]] = None
+) -> None:
+    """
+    Checks for cancellation between nodes. Once the execution is cancelled, the nodes ready to run are dropped and
+    the ones waiting for a worker are cancelled, so only the nodes already running finish. They all keep their status.
+    The executor raises Cancelled once they are done.
+    """
+    if cancel is None or not cancel.cancelled:
+        return
+    ready.clear()
+    if pending is not None:
+        for future in list(pending):
+            if future.cancel():
+                del pending[future]
+
+
+def execute_serial(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes the nodes of the plan one after the other in topological order.
+
+    With `release_values` set, every intermediate value is dropped as soon as the last node reading it is done, see
+    node_editor.liveness. See execute_threaded for `cancel` and `node_timeout`.
+    """
+    nodes, schedule = plan.nodes, plan.schedule
+    liveness = Liveness(plan) if release_values else None
+    executed = [False] * len(nodes)
+    failed = [False] * len(nodes)
+    for node_index in schedule.order:
+        if cancel is not None:
+            cancel.check()
+        if upstream_failed(node_index, nodes, schedule, failed):
+            pass
+        elif not only_dirty or needs_execution(node_index, nodes, schedule, executed):
+            executed[node_index] = True
+            node = nodes[node_index]
+            error = run_node(node, plan.bindings[node_index], timeout_of(node, node_timeout), cancel)
+            failed[node_index] = error is not None
+            finish_node(node, error)
+        if liveness is not None:
+            liveness.done(node_index)
+    if cancel is not None:
+        cancel.check()
+
+
+def execute_threaded(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    max_workers: Optional[int] = None,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes the nodes on a thread pool, dispatching each node as soon as all of its upstream nodes are done.
+
+    Independent nodes overlap whenever their compute releases the GIL (NumPy, I/O, subprocesses...). Node classes
+    with `main_thread_only` set are run on the calling thread instead, or on the GUI thread when the editor set one
+    with set_main_thread. Statuses are always set from the calling thread.
+
+    Args:
+        plan: The compiled graph to execute.
+        only_dirty: Skip CLEAN nodes whose upstream nodes didn't run.
+        max_workers: The number of worker threads. Defaults to the ThreadPoolExecutor default.
+        release_values: Drop every intermediate value as soon as the last node reading it is done, see
+            node_editor.liveness.
+        cancel: Checked between nodes. Once it is cancelled, the nodes that are running finish and Cancelled is
+            raised. See node_editor.cancellation.
+        node_timeout: The number of seconds after which a node fails with NodeTimeout, for the node classes without
+            a timeout of their own.
+
+    Raises:
+        Cancelled: If the execution was cancelled.
+    """
+    nodes, schedule = plan.nodes, plan.schedule
+    remaining = schedule.in_degrees()
+    executed = [False] * len(nodes)
+    failed = [False] * len(nodes)
+    ready: Deque[int] = deque(v for v in range(len(nodes)) if remaining[v] == 0)
+    pending: Dict[Future[Optional[Exception]], int] = {}
+    liveness = Liveness(plan) if release_values else None
+
+    def complete(node_index: int) -> None:
+        if liveness is not None:
+            liveness.done(node_index)
+        for successor in schedule.successors[node_index]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="node-worker") as pool:
+        while ready or pending:
+            stop_if_cancelled(cancel, ready, pending)
+            while ready:
+                node_index = ready.popleft()
+                node = nodes[node_index]
+                if upstream_failed(node_index, nodes, schedule, failed) or (
+                    only_dirty and not needs_execution(node_index, nodes, schedule, executed)
+                ):
+                    complete(node_index)
+                    continue
+
+                executed[node_index] = True
+                bindings = plan.bindings[node_index]
+                timeout = timeout_of(node, node_timeout)
+                if node.main_thread_only:
+                    error = run_node(node, bindings, timeout, cancel)
+                    failed[node_index] = error is not None
+                    finish_node(node, error)
+                    complete(node_index)
+                else:
+                    pending[pool.submit(run_node, node, bindings, timeout, cancel)] = node_index
+
+            if not pending:
+                continue
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                node_index = pending.pop(future)
+                error = future.result()
+                failed[node_index] = error is not None
+                finish_node(nodes[node_index], error)
+                complete(node_index)
+
+    if cancel is not None:
+        cancel.check()
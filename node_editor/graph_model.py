@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from node_editor.connection import Connection
+    from node_editor.node import Node
+
+
+class GraphModel:
+    """
+    The nodes and connections of a graph, with the adjacency of every node, independent of Qt.
+
+    The scene keeps it up to date as items are added and removed and as connections are made, so graph queries never
+    have to walk the scene's items (which also include pins, texts and proxy widgets). Items are registered by id, so
+    adding, removing and looking up a node or a connection is O(1). Registries keep insertion order.
+
+    A connection is registered as soon as it is added, but only becomes an edge once both of its ends are on a pin of
+    a registered node. Edges go from the node of the output pin to the node of the input pin.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[int, Node] = {}
+        self._connections: Dict[int, Connection] = {}
+        self._by_type: Dict[type, Dict[int, Node]] = {}
+        # The (start node, end node) of every connection with both ends connected
+        self._edges: Dict[int, Tuple[Node, Node]] = {}
+        # The edges going out of and into every node, as {connection id: connection}
+        self._out: Dict[int, Dict[int, Connection]] = {}
+        self._in: Dict[int, Dict[int, Connection]] = {}
+
+    # Nodes
+
+    def add_node(self, node: Node) -> None:
+        if id(node) in self._nodes:
+            return
+        self._nodes[id(node)] = node
+        self._by_type.setdefault(type(node), {})[id(node)] = node
+        self._out[id(node)] = {}
+        self._in[id(node)] = {}
+        # Its connections may have been registered before it
+        for pin in node._pins:
+            for connection in pin.connections.values():
+                self.update_connection(connection)
+
+    def remove_node(self, node: Node) -> None:
+        """Removes a node along with its edges. Its connections stay registered until they are removed too."""
+        if self._nodes.pop(id(node), None) is None:
+            return
+        self._by_type[type(node)].pop(id(node), None)
+        for connection in list(self._out.pop(id(node), {}).values()) + list(self._in.pop(id(node), {}).values()):
+            self._drop_edge(connection)
+
+    def has_node(self, node: Node) -> bool:
+        return id(node) in self._nodes
+
+    def nodes(self) -> List[Node]:
+        return list(self._nodes.values())
+
+    def nodes_of_type(self, node_class: type) -> List[Node]:
+        """Returns the nodes that are instances of a class, in O(number of node classes) plus the result."""
+        nodes: List[Node] = []
+        for cls, registry in self._by_type.items():
+            if issubclass(cls, node_class):
+                nodes.extend(registry.values())
+        return nodes
+
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    # Connections
+
+    def add_connection(self, connection: Connection) -> None:
+        self._connections[id(connection)] = connection
+        self.update_connection(connection)
+
+    def remove_connection(self, connection: Connection) -> None:
+        self._connections.pop(id(connection), None)
+        self._drop_edge(connection)
+
+    def update_connection(self, connection: Connection) -> None:
+        """Updates the edge of a connection after one of its ends changed, or its ends were swapped."""
+        if id(connection) not in self._connections:
+            return
+        self._drop_edge(connection)
+        start_pin, end_pin = connection.start_pin, connection.end_pin
+        if start_pin is None or end_pin is None:
+            return
+        if not start_pin.is_output:  # Until a wire dragged from an input is dropped, see update_start_and_end_pos
+            start_pin, end_pin = end_pin, start_pin
+        start, end = start_pin.node, end_pin.node
+        if start is None or end is None or id(start) not in self._nodes or id(end) not in self._nodes:
+            return
+        self._edges[id(connection)] = (start, end)
+        self._out[id(start)][id(connection)] = connection
+        self._in[id(end)][id(connection)] = connection
+
+    def _drop_edge(self, connection: Connection) -> None:
+        edge = self._edges.pop(id(connection), None)
+        if edge is None:
+            return
+        start, end = edge
+        self._out.get(id(start), {}).pop(id(connection), None)
+        self._in.get(id(end), {}).pop(id(connection), None)
+
+    def connections(self) -> List[Connection]:
+        return list(self._connections.values())
+
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    # Adjacency
+
+    def out_connections(self, node: Node) -> List[Connection]:
+        return list(self._out.get(id(node), {}).values())
+
+    def in_connections(self, node: Node) -> List[Connection]:
+        return list(self._in.get(id(node), {}).values())
+
+    def downstream(self, node: Node) -> List[Node]:
+        """Returns the nodes fed by the node's outputs, once per connection."""
+        return [self._edges[key][1] for key in self._out.get(id(node), {})]
+
+    def upstream(self, node: Node) -> List[Node]:
+        """Returns the nodes feeding the node's inputs, once per connection."""
+        return [self._edges[key][0] for key in self._in.get(id(node), {})]
+
+    def clear(self) -> None:
+        self._nodes.clear()
+        self._connections.clear()
+        self._by_type.clear()
+        self._edges.clear()
+        self._out.clear()
+        self._in.clear()
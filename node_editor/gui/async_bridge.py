@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+from typing import Coroutine
+from typing import Optional
+
+from PySide6 import QtCore
+
+
+class AsyncioBridge(QtCore.QObject):
+    """
+    Runs coroutines on an asyncio event loop that is driven by the Qt event loop.
+
+    While a coroutine is running, a timer steps the asyncio loop once per tick. Everything runs on the GUI thread,
+    so coroutines can safely touch widgets and the editor keeps repainting and handling input between steps.
+
+    Attributes:
+        finished (Signal): Emitted once the coroutine completes.
+        error (BaseException): The exception raised by the last coroutine, or None.
+    """
+
+    finished = QtCore.Signal()
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None, interval: int = 5) -> None:
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self._task: Optional[asyncio.Task[Any]] = None
+        self.error: Optional[BaseException] = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._step)
+
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> bool:
+        """Starts running the coroutine. Returns False if another one is still running."""
+        if self._task is not None:
+            coro.close()
+            return False
+
+        self.error = None
+        self._task = self.loop.create_task(coro)
+        self._timer.start()
+        return True
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Cancels the coroutine and steps the loop until it stopped, for at most `timeout` seconds since a coroutine may
+        ignore the cancellation or block. The loop is closed either way.
+        """
+        self.cancel()
+        deadline = time.monotonic() + timeout
+        while self._task is not None and time.monotonic() < deadline:
+            self._step()
+        self._timer.stop()
+        self._task = None
+        self.loop.close()
+
+    def _step(self) -> None:
+        # Run a single iteration of the asyncio loop
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+        task = self._task
+        if task is None or not task.done():
+            return
+
+        self._timer.stop()
+        self._task = None
+        self.error = None if task.cancelled() else task.exception()
+        self.finished.emit()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from PySide6 import QtCore
+
+from node_editor import executors
+from node_editor.cancellation import CancelToken
+from node_editor.compute_graph import execute_plan
+from node_editor.compute_graph import ExecutionPlan
+from node_editor.control_flow import run_exec
+from node_editor.node import Node
+
+# Executing a graph on the GUI thread freezes the editor until the last node is done. The ExecutionThread runs it on
+# a background thread instead, so the editor keeps repainting and handling input, and the execution can be cancelled
+# or its nodes timed out (see node_editor.cancellation).
+#
+# What stays on the GUI thread:
+# - the nodes with `main_thread_only` set, which the background thread hands over and waits for,
+# - repainting the status lights, see Node_Graphics.set_status,
+# - the `finished` signal, emitted once the thread is done.
+#
+# A node edited while the execution runs may be set CLEAN by it right after, with the values from before the edit.
+# The nodes edited during an execution are marked DIRTY again once it finished, so the next one recomputes them.
+
+
+class _MainThread(QtCore.QObject):
+    # Runs functions on the thread it lives on, blocking the thread asking until they are done
+    call = QtCore.Signal(object)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self.call.connect(self._call, QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+
+    @staticmethod
+    def _call(function: Callable[[], None]) -> None:
+        function()
+
+    def run(self, function: Callable[[], Optional[Exception]]) -> Optional[Exception]:
+        if QtCore.QThread.currentThread() == self.thread():
+            return function()
+        result: List[Optional[Exception]] = []
+        self.call.emit(lambda: result.append(function()))
+        return result[0]
+
+
+class ExecutionThread(QtCore.QObject):
+    """
+    Executes graphs, or the exec chains of trigger nodes, on a background thread, one at a time.
+
+    Attributes:
+        finished (Signal): Emitted on the GUI thread once an execution completes, fails or is cancelled.
+        error (BaseException): The exception raised by the last execution, e.g. Cancelled, or None.
+    """
+
+    finished = QtCore.Signal()
+    _done = QtCore.Signal()
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self.error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cancel: Optional[CancelToken] = None
+        self._edited: List[Node] = []
+        self._main_thread = _MainThread(self)
+        executors.set_main_thread(self._main_thread.run)
+        self._done.connect(self._on_done, QtCore.Qt.ConnectionType.QueuedConnection)
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def run(
+        self,
+        plan: ExecutionPlan,
+        mode: str = "serial",
+        max_workers: Optional[int] = None,
+        node_timeout: Optional[float] = None,
+    ) -> bool:
+        """Starts executing the plan, see execute_plan. Returns False if an execution is still running."""
+        return self._start(
+            lambda cancel: execute_plan(
+                plan, mode=mode, max_workers=max_workers, cancel=cancel, node_timeout=node_timeout
+            )
+        )
+
+    def fire(self, trigger: Node, node_timeout: Optional[float] = None) -> bool:
+        """Starts running the exec chain of a trigger node, see run_exec. Returns False if an execution is running."""
+        return self._start(lambda cancel: run_exec(trigger, cancel=cancel, node_timeout=node_timeout))
+
+    def _start(self, function: Callable[[CancelToken], object]) -> bool:
+        if self._thread is not None:
+            return False
+
+        self.error = None
+        self._edited = []
+        cancel = self._cancel = CancelToken()
+
+        def execute() -> None:
+            try:
+                function(cancel)
+            except BaseException as e:
+                self.error = e
+            finally:
+                self._done.emit()
+
+        self._thread = threading.Thread(target=execute, name="graph-execution", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self) -> None:
+        """Stops the execution once the nodes that are running are done."""
+        if self._cancel is not None:
+            self._cancel.cancel()
+
+    def node_edited(self, node: Node) -> None:
+        """Records an edit of a node made while an execution runs, see NodeScene.node_edited."""
+        if self._thread is not None:
+            self._edited.append(node)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Cancels the execution and waits for it to stop, for at most `timeout` seconds since a node may never return.
+        The background thread doesn't keep the application from exiting.
+        """
+        self.cancel()
+        deadline = time.monotonic() + timeout
+        while self._thread is not None and time.monotonic() < deadline:
+            # Keep handling the calls of the background thread until it is done
+            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 50)
+        executors.set_main_thread(None)
+
+    def _on_done(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+        self._cancel = None
+
+        edited, self._edited = self._edited, []
+        for node in edited:
+            node.mark_dirty()
+        self.finished.emit()
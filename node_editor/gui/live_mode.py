@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from PySide6 import QtCore
+
+from node_editor.gui.async_bridge import AsyncioBridge
+from node_editor.gui.execution_thread import ExecutionThread
+from node_editor.gui.node_widget import NodeScene
+
+# In live mode the graph is executed again on its own whenever it changes: a widget edit marks its node and everything
+# downstream DIRTY, and a connection change marks the node it feeds, so the execution (which skips CLEAN nodes) only
+# recomputes what the edit affects.
+#
+# Changes are debounced: every change restarts a short timer and the graph is only executed once it runs out, so a
+# burst of keystrokes causes a single execution with the last value. If a change arrives while an execution is still
+# running, that execution is cancelled since its results are stale, and a new one starts once it stopped. The nodes it
+# didn't get to are still DIRTY, so nothing is lost.
+
+DEFAULT_DELAY = 200  # Milliseconds
+
+Runner = Union[AsyncioBridge, ExecutionThread]
+
+
+class LiveMode(QtCore.QObject):
+    """
+    Executes a scene's graph again shortly after it changes.
+
+    Args:
+        scene: The scene to watch.
+        execute: Executes the graph, e.g. NodeEditor.execute_graph.
+        runners: What executions run on when they don't block, so they can be superseded by new changes.
+        delay: The debounce window in milliseconds.
+    """
+
+    def __init__(
+        self,
+        scene: NodeScene,
+        execute: Callable[[], None],
+        runners: Sequence[Runner] = (),
+        delay: int = DEFAULT_DELAY,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.scene = scene
+        self.execute = execute
+        self.runners = list(runners)
+        self.enabled = False
+        self._executing = False
+        self._superseded = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._run)
+        scene.graph_changed.connect(self.schedule)
+        for runner in self.runners:
+            runner.finished.connect(self._on_finished)
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if enabled:
+            self.schedule()
+        else:
+            self._timer.stop()
+
+    def is_pending(self) -> bool:
+        return bool(self._timer.isActive())
+
+    def schedule(self) -> None:
+        """Executes the graph once no change arrived for the debounce window."""
+        # Nodes marked DIRTY by the execution itself don't trigger another one
+        if not self.enabled or self._executing:
+            return
+        self._timer.start()  # Restarts it if it was already running
+
+    def _run(self) -> None:
+        running = [runner for runner in self.runners if runner.is_running()]
+        if running:
+            # _on_finished schedules a new execution once the cancelled one stopped
+            self._superseded = True
+            for runner in running:
+                runner.cancel()
+            return
+
+        self._executing = True
+        try:
+            self.execute()
+        finally:
+            self._executing = False
+
+    def _on_finished(self) -> None:
+        if self._superseded:
+            self._superseded = False
+            self.schedule()
@@ -40,6 +40,8 @@ class NodeEditor(QtWidgets.QWidget):  # type: ignore
         self.setGeometry(100, 100, 800, 600)
         self.connection: Optional[Connection] = None
         self.port: Optional[Pin] = None
+        self._grabbed: Optional[Connection] = None  # The connection being dragged off its input, if any
+        self._grab_pos = QtCore.QPointF()  # Where the grabbed connection was pressed
         self.scene: QGraphicsScene
         self._last_selected: Optional[Node] = None
 
@@ -103,6 +105,8 @@ class NodeEditor(QtWidgets.QWidget):  # type: ignore
                     self.connection.start_pos = item.start_pos
                     self.scene.addItem(self.connection)
                     self.port = item.start_pin
+                    self._grabbed = item
+                    self._grab_pos = event.scenePos()
                     self.connection.end_pos = event.scenePos()
                     self.connection.update_start_and_end_pos()  # to fix the offset
                     return True
@@ -140,6 +144,14 @@ class NodeEditor(QtWidgets.QWidget):  # type: ignore
 
         elif event.type() == QtCore.QEvent.GraphicsSceneMouseRelease:
             if self.connection and event.button() == QtCore.Qt.LeftButton:
+                if self._grabbed and not self._dragged_from_grab(event.scenePos()):
+                    # A plain click on a connection keeps it, only the wire started from it goes
+                    self.connection.delete()
+                    self.connection = None
+                    self.port = None
+                    self._grabbed = None
+                    return True
+
                 item = self.item_at(event.scenePos())
 
                 # connecting a port
@@ -147,13 +159,10 @@ class NodeEditor(QtWidgets.QWidget):  # type: ignore
                     if self.port.can_connect_to(item):
                         # print("Making connection")
 
-                        # delete existing connection on the new port
-                        if item.connection:
-                            item.connection.delete()
-
-                        # delete existing connection to the original port
-                        self.port.clear_connection()
-                        item.clear_connection()
+                        # An input takes a single connection, so replace the one it has. Outputs keep theirs
+                        # since they can feed any number of inputs
+                        input_pin = item if self.port.is_output else self.port
+                        input_pin.clear_connection()
 
                         self.connection.set_start_pin(self.port)
                         self.connection.set_end_pin(item)
@@ -168,6 +177,15 @@ class NodeEditor(QtWidgets.QWidget):  # type: ignore
                     self.connection.delete()
                 self.connection = None
                 self.port = None
+
+                # The grabbed connection was moved to the new one, or dropped, either way it's gone
+                if self._grabbed:
+                    self._grabbed.delete()
+                self._grabbed = None
                 return True
 
         return bool(super().eventFilter(watched, event))
+
+    def _dragged_from_grab(self, position: QtCore.QPointF) -> bool:
+        """Returns True if the mouse moved far enough from where the grabbed connection was pressed to drag it."""
+        return (position - self._grab_pos).manhattanLength() >= QtWidgets.QApplication.startDragDistance()
@@ -13,10 +13,39 @@ from node_editor.common import Node_Status
 from node_editor.pin import Pin
 
 
+class _Repainter(QtCore.QObject):
+    # Items can only be repainted from the GUI thread. The statuses set on other threads, e.g. by an execution running
+    # in the background, are repainted through a queued signal instead
+    repaint = QtCore.Signal(object)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.repaint.connect(self._repaint)
+
+    def _repaint(self, item: QtWidgets.QGraphicsItem) -> None:
+        try:
+            item.update()
+        except RuntimeError:
+            pass  # The item was deleted in the meantime
+
+    def update(self, item: QtWidgets.QGraphicsItem) -> None:
+        if QtCore.QThread.currentThread() == self.thread():
+            item.update()
+        else:
+            self.repaint.emit(item)
+
+
+_repainter: Optional[_Repainter] = None
+
+
 class Node_Graphics(QtWidgets.QGraphicsItem):  # type: ignore
     def __init__(self) -> None:
         super().__init__()
 
+        global _repainter
+        if _repainter is None:
+            _repainter = _Repainter()  # Nodes are made on the GUI thread, which the repainter has to live on
+
         self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
 
@@ -53,6 +82,12 @@ class Node_Graphics(QtWidgets.QGraphicsItem):  # type: ignore
         elif self.status == Node_Status.ERROR:
             return QtGui.QColor(255, 0, 0)
 
+    def set_status(self, status: Node_Status) -> None:
+        if status != self.status:
+            self.status = status
+            if _repainter is not None:
+                _repainter.update(self)  # repaint the status light
+
     def boundingRect(self) -> QtCore.QRectF:
         return self.size
 
@@ -165,12 +200,13 @@ class Node_Graphics(QtWidgets.QGraphicsItem):  # type: ignore
         total_height = bg_height + self.widget.size().height()
 
         pin_dim = None
+        pin_metrics = QtGui.QFontMetrics(pin_font)
         # Add the heigth for each of the pins
         exec_height_added = False
         for pin in self._pins:
             pin_dim = {
-                "w": QtGui.QFontMetrics(pin_font).horizontalAdvance(pin.name),
-                "h": QtGui.QFontMetrics(pin_font).height(),
+                "w": pin_metrics.horizontalAdvance(pin.name),
+                "h": pin_metrics.height(),
             }
 
             if pin_dim["w"] > total_width:
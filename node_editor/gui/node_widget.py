@@ -6,17 +6,90 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
+from PySide6 import QtCore
 from PySide6 import QtGui
 from PySide6 import QtWidgets
 
+from node_editor.compute_graph import ExecutionPlan
 from node_editor.connection import Connection
+from node_editor.graph_model import GraphModel
 from node_editor.gui.node_editor import NodeEditor
 from node_editor.gui.view import View
 from node_editor.node import Node
-from node_editor.pin import Pin
 
 
 class NodeScene(QtWidgets.QGraphicsScene):  # type: ignore
+    """
+    The scene holding the nodes and connections of a graph.
+
+    Attributes:
+        graph_changed (Signal): Emitted when a node or a connection is added or removed, or when a node's values
+            change and it is marked DIRTY, e.g. by an edit of one of its widgets.
+        node_edited (Signal): Emitted with the node when it is marked DIRTY, before graph_changed.
+        exec_fired (Signal): Emitted with a trigger node, e.g. a button, to have the editor run its exec chain. See
+            fire_exec.
+    """
+
+    graph_changed = QtCore.Signal()
+    node_edited = QtCore.Signal(object)
+    exec_fired = QtCore.Signal(object)
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.model = GraphModel()  # The nodes and connections of the scene, see get_items_by_type
+        self._plan: Optional[ExecutionPlan] = None  # Compiled on demand, dropped on structural edits
+
+    def addItem(self, item: QtWidgets.QGraphicsItem) -> None:
+        super().addItem(item)
+        if isinstance(item, Node):
+            self.model.add_node(item)
+            self.invalidate_plan()
+        elif isinstance(item, Connection):
+            self.model.add_connection(item)
+
+    def removeItem(self, item: QtWidgets.QGraphicsItem) -> None:
+        super().removeItem(item)
+        if isinstance(item, Node):
+            self.model.remove_node(item)
+            self.invalidate_plan()
+        elif isinstance(item, Connection):
+            self.model.remove_connection(item)
+
+    def clear(self) -> None:
+        super().clear()
+        self.model.clear()
+        self.invalidate_plan()
+
+    def connection_changed(self, connection: Connection) -> None:
+        """Called by a connection when one of its ends is connected, disconnected or swapped."""
+        self.model.update_connection(connection)
+        self.invalidate_plan()
+
+    def node_changed(self, node: Node) -> None:
+        """Called by a node when it is marked DIRTY."""
+        self.node_edited.emit(node)
+        self.graph_changed.emit()
+
+    def fire_exec(self, trigger: Node) -> None:
+        """Called by a trigger node to run the nodes wired to its exec outputs, see node_editor.control_flow."""
+        self.exec_fired.emit(trigger)
+
+    def invalidate_plan(self) -> None:
+        """Drops the compiled execution plan. Called whenever a node or a connection is added or removed."""
+        self._plan = None
+        self.graph_changed.emit()
+
+    def get_execution_plan(self) -> ExecutionPlan:
+        """
+        Returns the compiled execution plan of the scene, compiling it if the graph changed since the last call.
+
+        Raises:
+            CycleError: If the graph contains a cycle.
+        """
+        if self._plan is None:
+            self._plan = ExecutionPlan(self.model.nodes(), self.model.connections())
+        return self._plan
+
     def dragEnterEvent(self, e: QtGui.QDragEnterEvent) -> None:
         e.acceptProposedAction()
 
@@ -29,15 +102,20 @@ class NodeScene(QtWidgets.QGraphicsScene):  # type: ignore
         e.acceptProposedAction()
 
     def get_items_by_type(self, item_class: type) -> List[Any]:
-        items = []
-        for item in self.items():
-            print(f"current item: {item}, class: {item_class}")
-            if isinstance(item, item_class):
-                items.append(item)
-        return items
+        """
+        Returns the items of the scene that are instances of a class.
+
+        Nodes and connections come from the graph model, in the order they were added. Other item types fall back
+        to walking every item of the scene.
+        """
+        if issubclass(item_class, Node):
+            return self.model.nodes_of_type(item_class)
+        if issubclass(item_class, Connection):
+            return [item for item in self.model.connections() if isinstance(item, item_class)]
+        return [item for item in self.items() if isinstance(item, item_class)]
 
     def get_total_nodes(self) -> int:
-        return len(self.get_items_by_type(Node))
+        return self.model.node_count()
 
     # TODO Scene should delete the node
     # TODO Scene should reorder Node indexes after Node delete
@@ -52,7 +130,7 @@ class NodeScene(QtWidgets.QGraphicsScene):  # type: ignore
 
         # Reindex the nodes
         for node in nodes:
-            node.index = new_index_mapping[str(node.index)]
+            node.index = new_index_mapping[node.index]
 
     def delete_connection(self, connection_to_delete: Connection) -> None:
         # We an safly delete a connection without having to do anything extra
@@ -120,6 +198,8 @@ class NodeWidget(QtWidgets.QWidget):  # type: ignore
                     continue
                 node_item = info["class"]()
                 node_item.index = node["index"]
+                if "state" in node:
+                    node_item.set_widget_state(node["state"])
                 self.scene.addItem(node_item)
                 node_item.setPos(node["x"], node["y"])
 
@@ -150,49 +230,34 @@ class NodeWidget(QtWidgets.QWidget):  # type: ignore
         # Maybe connections will need an index for each so they can be sorted and kept in order.
         scene: Dict[str, List[Any]] = {"nodes": [], "connections": []}
 
-        # Need the nodes, and connections of ports to nodes
-        for item in self.scene.items():
-            # Connections
-            if isinstance(item, Connection):
-                # print(f"Name: {item}")
-                nodes = item.nodes()
-                if nodes[0]:
-                    start_id = str(nodes[0].index)
-                else:
-                    continue
-                end_id = str(nodes[1].index)  # type: ignore
-                start_pin = item.start_pin.name  # type: ignore
-                end_pin = item.end_pin.name  # type: ignore
-                # print(f"Node ids {start_id, end_id}")
-                # print(f"connected ports {item.start_pin.name(), item.end_pin.name()}")
-
-                connection = {
-                    "start_id": start_id,
-                    "end_id": end_id,
-                    "start_pin": start_pin,
-                    "end_pin": end_pin,
-                }
-                scene["connections"].append(connection)
-                continue
+        # Need the nodes, and connections of ports to nodes. The graph model keeps them in the order they were added
+        for node in self.scene.model.nodes():
+            pos = node.pos().toPoint()
+            x, y = pos.x(), pos.y()
 
-            # Pins
-            if isinstance(item, Pin):
-                continue
+            obj_type = type(node).__name__
+
+            node_id = str(node.index)
 
-            # Nodes
-            if isinstance(item, Node):
-                # print("found node")
-                pos = item.pos().toPoint()
-                x, y = pos.x(), pos.y()
-                # print(f"pos: {x, y}")
+            node_data = {"type": obj_type, "x": x, "y": y, "index": node_id}
 
-                obj_type = type(item).__name__
-                # print(f"node type: {obj_type}")
+            state = node.get_widget_state()
+            if state is not None:
+                node_data["state"] = state
+            scene["nodes"].append(node_data)
 
-                node_id = str(item.index)
+        for connection in self.scene.model.connections():
+            start_pin, end_pin = connection.start_pin, connection.end_pin
+            if start_pin is None or end_pin is None or start_pin.node is None or end_pin.node is None:
+                continue  # A loose end, e.g. a connection that is being dragged
 
-                node = {"type": obj_type, "x": x, "y": y, "index": node_id}
-                scene["nodes"].append(node)
+            connection_data = {
+                "start_id": str(start_pin.node.index),
+                "end_id": str(end_pin.node.index),
+                "start_pin": start_pin.name,
+                "end_pin": end_pin.name,
+            }
+            scene["connections"].append(connection_data)
 
         # Write the items_info dictionary to a JSON file
         with open(json_path, "w") as f:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from PySide6 import QtCore
@@ -10,6 +12,14 @@ from PySide6.QtCore import Qt
 
 
 class Pin_Graphics(QtWidgets.QGraphicsPathItem):  # type: ignore
+    # Graphs can have hundreds of thousands of pins, so the font, its metrics and the paths are shared between pins
+    # rather than created for each one. QPainterPath is implicitly shared, so pins can hold the same path. They are
+    # created on first use since fonts need a QGuiApplication
+    _shared_font: Optional[QtGui.QFont] = None
+    _shared_font_metrics: Optional[QtGui.QFontMetrics] = None
+    _shared_paths: Dict[Tuple[str, float], QtGui.QPainterPath] = {}  # Shapes, by (kind, radius)
+    _shared_text_paths: Dict[Tuple[str, bool], QtGui.QPainterPath] = {}  # Labels, by (name, is_output)
+
     def __init__(self, parent: Optional[QtWidgets.QGraphicsItem], scene: QtWidgets.QGraphicsScene) -> None:
         super().__init__(parent)
 
@@ -18,14 +28,14 @@ class Pin_Graphics(QtWidgets.QGraphicsPathItem):  # type: ignore
 
         self.execution: bool = False
 
-        path: QtGui.QPainterPath = QtGui.QPainterPath()
-        path.addEllipse(-self.radius_, -self.radius_, 2 * self.radius_, 2 * self.radius_)
-
-        self.setPath(path)
+        self.setPath(self._shape_path("circle"))
 
         self.setFlag(QtWidgets.QGraphicsPathItem.ItemSendsScenePositionChanges)
-        self.font: QtGui.QFont = QtGui.QFont()
-        self.font_metrics: QtGui.QFontMetrics = QtGui.QFontMetrics(self.font)
+        if Pin_Graphics._shared_font is None or Pin_Graphics._shared_font_metrics is None:
+            Pin_Graphics._shared_font = QtGui.QFont()
+            Pin_Graphics._shared_font_metrics = QtGui.QFontMetrics(Pin_Graphics._shared_font)
+        self.font: QtGui.QFont = Pin_Graphics._shared_font
+        self.font_metrics: QtGui.QFontMetrics = Pin_Graphics._shared_font_metrics
 
         self.pin_text_height: int = self.font_metrics.height()
 
@@ -34,14 +44,18 @@ class Pin_Graphics(QtWidgets.QGraphicsPathItem):  # type: ignore
         self.text_path: QtGui.QPainterPath = QtGui.QPainterPath()
 
         self.name: str = ""  # Add this line to define self.name
-        self.connection: Optional[Union[QtWidgets.QGraphicsItem, QtCore.QObject]] = (
-            None  # Add this line to define self.connection
-        )
+        self.connections: Dict[int, Union[QtWidgets.QGraphicsItem, QtCore.QObject]] = {}
 
-    def set_execution(self, execution: bool) -> None:
-        if execution:
-            path: QtGui.QPainterPath = QtGui.QPainterPath()
+    def _shape_path(self, kind: str) -> QtGui.QPainterPath:
+        key = (kind, self.radius_)
+        path = Pin_Graphics._shared_paths.get(key)
+        if path is not None:
+            return path
 
+        path = QtGui.QPainterPath()
+        if kind == "circle":
+            path.addEllipse(-self.radius_, -self.radius_, 2 * self.radius_, 2 * self.radius_)
+        else:
             points: list[QtCore.QPointF] = [
                 QtCore.QPointF(-6, -7),
                 QtCore.QPointF(-6, 7),
@@ -51,21 +65,32 @@ class Pin_Graphics(QtWidgets.QGraphicsPathItem):  # type: ignore
                 QtCore.QPointF(-6, -7),
             ]
             path.addPolygon(QtGui.QPolygonF(points))
-            self.setPath(path)
+        Pin_Graphics._shared_paths[key] = path
+        return path
+
+    def set_execution(self, execution: bool) -> None:
+        if execution:
+            self.setPath(self._shape_path("execution"))
 
     def set_name(self, name: str) -> None:
         self.name = name  # Add this line to set self.name
         nice_name: str = self.name.replace("_", " ").title()
         self.pin_text_width: int = self.font_metrics.horizontalAdvance(nice_name)
 
-        if self.is_output:
-            x = -self.radius_ - self.margin - self.pin_text_width
-        else:
-            x = self.radius_ + self.margin
+        key = (nice_name, self.is_output)
+        text_path = Pin_Graphics._shared_text_paths.get(key)
+        if text_path is None:
+            if self.is_output:
+                x = -self.radius_ - self.margin - self.pin_text_width
+            else:
+                x = self.radius_ + self.margin
 
-        y: float = self.pin_text_height / 4
+            y: float = self.pin_text_height / 4
 
-        self.text_path.addText(x, y, self.font, nice_name)
+            text_path = QtGui.QPainterPath()
+            text_path.addText(x, y, self.font, nice_name)
+            Pin_Graphics._shared_text_paths[key] = text_path
+        self.text_path = text_path
 
     def paint(
         self,
@@ -95,11 +120,12 @@ class Pin_Graphics(QtWidgets.QGraphicsPathItem):  # type: ignore
             painter.drawPath(self.text_path)
 
     def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value: object) -> object:
-        if change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged and self.connection:
-            if hasattr(self.connection, "update_start_and_end_pos"):
-                self.connection.update_start_and_end_pos()
+        if change == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged:
+            for connection in self.connections.values():
+                if hasattr(connection, "update_start_and_end_pos"):
+                    connection.update_start_and_end_pos()
         return value
 
     def is_connected(self) -> bool:
         # Add this method to resolve the 'is_connected' call in the paint method
-        return self.connection is not None
+        return bool(self.connections)
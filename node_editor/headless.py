@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from node_editor.common import Node_Status
+
+# Qt-free stand-ins for the graphics base classes of Node, Pin and Connection. They are used in place of the
+# node_editor.gui classes when running headless (see node_editor.common.is_headless), so a graph can be loaded and
+# executed without importing PySide6. Only the data side of the graphics classes is kept; drawing is a no-op.
+
+
+class Node_Graphics:
+    def __init__(self) -> None:
+        self.title_text = "Title"
+        self.type_text = "base"
+        self.title_color: Tuple[int, int, int] = (123, 33, 177)
+        self.node_color: Tuple[int, int, int] = (20, 20, 20)
+        self.status = Node_Status.DIRTY
+        self.widget: Any = None
+        self._pins: List[Any] = []
+        self.index: int
+
+    def set_status(self, status: Node_Status) -> None:
+        self.status = status
+
+    def set_color(
+        self, title_color: Tuple[int, int, int], background_color: Optional[Tuple[int, int, int]] = None
+    ) -> None:
+        self.title_color = title_color
+        self.node_color = background_color if background_color is not None else (20, 20, 20)
+
+    def build(self) -> None:
+        # No widget is built when headless, so init_widget isn't called either
+        pass
+
+    def update(self) -> None:
+        pass
+
+    def scene(self) -> Any:
+        return None
+
+    def setPos(self, x: float, y: float) -> None:
+        pass
+
+
+class Pin_Graphics:
+    # Together with Pin's own slots, headless pins have no __dict__
+    __slots__ = ("execution", "is_output", "name", "connections")
+
+    def __init__(self, parent: Any, scene: Any) -> None:
+        self.execution: bool = False
+        self.is_output: bool = False
+        self.name: str = ""
+        self.connections: Dict[int, Any] = {}
+
+    def set_execution(self, execution: bool) -> None:
+        pass
+
+    def set_name(self, name: str) -> None:
+        pass
+
+    def scenePos(self) -> Any:
+        return None
+
+    def update(self) -> None:
+        pass
+
+
+class Connection_Graphics:
+    def __init__(self, parent: Any = None) -> None:
+        self.start_pos: Any = None
+        self.end_pos: Any = None
+        self._do_highlight: bool = False
+
+    def update_path(self) -> None:
+        pass
+
+    def scene(self) -> Any:
+        return None
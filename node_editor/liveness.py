@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import List
+from typing import TYPE_CHECKING
+
+from node_editor.common import Node_Status
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.pin import Pin
+
+# By default every pin keeps its value after an execution, so the peak memory of a run is the sum of all the
+# intermediate values of the graph. When values are released, a value is dropped as soon as the last node that reads
+# it is done, which bounds the memory of a deep pipeline by its width rather than its size.
+#
+# Some values are always kept:
+# - the outputs that feed no node, since they are the results of the graph,
+# - the pins marked with Pin.retained, and the outputs of node classes with Node.retain_outputs set, e.g. to keep
+#   showing or inspecting them after the execution.
+#
+# A released pin is left without a value, the same as a pin that was never set. Its node is set to DIRTY since its
+# outputs are gone, so the next execution computes it again (memoized nodes get them back from the memo cache).
+
+
+class Liveness:
+    """
+    Tracks which nodes still have to read the outputs of every node during an execution.
+
+    Executors call done() on every node once it ran or was skipped, in any order that respects the schedule.
+    """
+
+    def __init__(self, plan: ExecutionPlan) -> None:
+        self.plan = plan
+        # For every node, the number of its downstream nodes that aren't done yet
+        self._readers: List[int] = [len(set(successors)) for successors in plan.schedule.successors]
+        self._upstream: List[List[int]] = [list(set(predecessors)) for predecessors in plan.schedule.predecessors]
+        # For every node, its output pins that feed other nodes
+        self._read_pins: List[List[Pin]] = [[] for _ in plan.nodes]
+        position = {id(node): i for i, node in enumerate(plan.nodes)}
+        seen = set()
+        for bindings in plan.bindings:
+            for _, output_pin in bindings:
+                node_index = position.get(id(output_pin.node))
+                if node_index is not None and id(output_pin) not in seen:
+                    seen.add(id(output_pin))
+                    self._read_pins[node_index].append(output_pin)
+
+    def done(self, node_index: int) -> None:
+        """Releases the inputs of a node that is done, and the outputs it was the last reader of."""
+        for input_pin, _ in self.plan.bindings[node_index]:
+            self._release(input_pin)
+
+        for upstream in self._upstream[node_index]:
+            self._readers[upstream] -= 1
+            if self._readers[upstream] == 0:
+                self.release_outputs(upstream)
+
+    def release_outputs(self, node_index: int) -> None:
+        """Releases the outputs of a node that other nodes read, setting it to DIRTY if any had a value."""
+        released = [self._release(pin) for pin in self._read_pins[node_index]]
+        node = self.plan.nodes[node_index]
+        if any(released) and node.status == Node_Status.CLEAN:
+            node.set_status(Node_Status.DIRTY)
+
+    @staticmethod
+    def _release(pin: Pin) -> bool:
+        if pin.retained or (pin.is_output and pin.node and pin.node.retain_outputs) or not hasattr(pin, "value"):
+            return False
+        del pin.value
+        return True
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from node_editor.node import Node
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, arrays are only hashed and sized without pickling when it's there
+    np = None
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class MemoCache:
+    """
+    A least recently used cache of node outputs, keyed by a fingerprint of the node's inputs.
+
+    The cache is bounded both by the number of entries and by the approximate size in bytes of the cached outputs.
+    When either budget is exceeded the least recently used entries are evicted.
+
+    Attributes:
+        max_entries (int): The maximum number of entries to keep.
+        max_bytes (int): The maximum total size of the cached outputs.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that didn't.
+        evictions (int): The number of entries evicted to stay within budget.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, Tuple[Dict[str, Any], int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, outputs: Dict[str, Any], size: int) -> None:
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (outputs, size)
+            self.total_bytes += size
+
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# One cache per node class, created on first use
+_caches: Dict[type, MemoCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(node_class: type) -> MemoCache:
+    """Returns the memo cache of a node class, using the class's `memo_max_entries` and `memo_max_bytes`."""
+    with _caches_lock:
+        cache = _caches.get(node_class)
+        if cache is None:
+            cache = MemoCache(
+                max_entries=getattr(node_class, "memo_max_entries", DEFAULT_MAX_ENTRIES),
+                max_bytes=getattr(node_class, "memo_max_bytes", DEFAULT_MAX_BYTES),
+            )
+            _caches[node_class] = cache
+        return cache
+
+
+def clear_caches() -> None:
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+
+
+def _as_buffer(value: Any) -> Optional[memoryview]:
+    # The raw bytes of an array or a byte buffer, without copying them when they are contiguous. None for other values
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return None
+        try:
+            return memoryview(np.ascontiguousarray(value)).cast("B")
+        except (TypeError, ValueError):
+            return None  # Dtypes without a buffer format, such as datetimes
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        view = memoryview(value)
+        return view.cast("B") if view.c_contiguous else memoryview(view.tobytes())
+    return None
+
+
+def _buffer(*description: Any) -> None:
+    # Stands in for a buffer in the pickle of a fingerprint, the buffer's bytes are hashed separately
+    pass
+
+
+class _FingerprintPickler(pickle.Pickler):
+    # Arrays, bytearrays and memoryviews (such as the read-only ones passed between pins, which can't be pickled) are
+    # hashed in place rather than copied into the pickle, which only records their type and shape. Pickle doesn't let
+    # bytes be overridden, they are pickled as usual
+    def __init__(self, file: io.BytesIO, hasher: Any) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.hasher = hasher
+
+    def reducer_override(self, obj: Any) -> Any:
+        view = _as_buffer(obj)
+        if view is None:
+            return NotImplemented
+        self.hasher.update(view)
+        if np is not None and isinstance(obj, np.ndarray):
+            return _buffer, ("ndarray", obj.dtype.str, obj.shape, view.nbytes)
+        return _buffer, ("buffer", view.nbytes)
+
+
+def fingerprint(value: Any) -> Optional[str]:
+    """Returns a stable hash of a picklable value, or None if the value can't be pickled."""
+    hasher = hashlib.blake2b(digest_size=20)
+    buffer = io.BytesIO()
+    try:
+        _FingerprintPickler(buffer, hasher).dump(value)
+    except Exception:
+        return None
+    hasher.update(buffer.getbuffer())
+    return hasher.hexdigest()
+
+
+def input_fingerprint(node: Node) -> Optional[str]:
+    """Fingerprints the values on a node's input pins together with the node's widget state."""
+    inputs = []
+    for pin in node._pins:
+        if pin.is_output or pin.execution:
+            continue
+        # Unset pins are distinguished from pins holding None
+        inputs.append((pin.name, hasattr(pin, "value"), getattr(pin, "value", None)))
+    return fingerprint((inputs, node.get_widget_state()))
+
+
+def _size_of_value(value: Any) -> int:
+    if np is not None and isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    # Only pickle the values whose size can't be read off directly
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def size_of(outputs: Dict[str, Any]) -> int:
+    """Approximates the memory held by a set of output values."""
+    return sum(_size_of_value(value) for value in outputs.values())
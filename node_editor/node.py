@@ -1,52 +1,333 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import contextvars
+import inspect
+from typing import Any
+from typing import Awaitable
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
-from node_editor.gui.node_graphics import Node_Graphics
+from node_editor import buffers
+from node_editor import disk_cache
+from node_editor import memo
+from node_editor import profiler
+from node_editor import spill
+from node_editor import streaming
+from node_editor.common import is_headless
+from node_editor.common import Node_Status
+from node_editor.graph_model import GraphModel
 from node_editor.pin import Pin
 
+if not is_headless():
+    from node_editor.gui.node_graphics import Node_Graphics
+else:
+    from node_editor.headless import Node_Graphics  # type: ignore
+
 # from PySide6 import QtCore
 # from PySide6 import QtGui
 # from PySide6 import QtWidgets
 # from PySide6.QtCore import Qt
-# rom node_editor.common import Node_Status
+
+
+async def _wait(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+
+def _run_to_completion(awaitable: Awaitable[Any]) -> None:
+    """Runs an awaitable on a new event loop, from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_wait(awaitable))
+        return
+
+    # asyncio.run can't be called while a loop is running on this thread (e.g. a node executed synchronously from a
+    # coroutine), so run it on a thread of its own. The context is copied for node_editor.cancellation.check()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(contextvars.copy_context().run, asyncio.run, _wait(awaitable)).result()
 
 
 class Node(Node_Graphics):
+    # Set memoize to True on node classes whose compute only depends on their inputs and widget state. Their outputs
+    # are then cached and reused when the same inputs come around again. See node_editor.memo
+    memoize: bool = False
+    memo_max_entries: int = memo.DEFAULT_MAX_ENTRIES
+    memo_max_bytes: int = memo.DEFAULT_MAX_BYTES
+    # Memoized outputs are also written to the disk cache when it is enabled, so they are reused across sessions. Set
+    # to False on node classes whose outputs are cheap to compute or expensive to store. See node_editor.disk_cache
+    memo_persist: bool = True
+
+    # Set to True on node classes whose compute touches Qt widgets, so threaded execution keeps them on the GUI thread
+    main_thread_only: bool = False
+
+    # Set to True on node classes that implement evaluate() as a pure function of the input values and widget state.
+    # The process execution mode then runs them in worker processes. See node_editor.process_pool
+    process_safe: bool = False
+
+    # Set to True on node classes whose compute works on whole columns of values (e.g. NumPy arrays) as well as on
+    # single values. Batch execution then computes them once per batch instead of once per row. See node_editor.batch
+    vectorized: bool = False
+
+    # Set streaming to True on node classes whose output pins hold streams of chunks (iterators, usually generators).
+    # Streams can only be consumed once, so these nodes are executed again on every run. A non-zero stream_buffer
+    # makes the outputs prefetch that many chunks on a background thread. See node_editor.streaming
+    streaming: bool = False
+    stream_buffer: int = 0
+
+    # Arrays and byte buffers on output pins are published as read-only views, so the nodes downstream share them
+    # without copying. Consumers call node_editor.buffers.writable() to get a private copy before mutating one.
+    # Set to False on node classes whose consumers need to mutate the outputs in place. See node_editor.buffers
+    readonly_outputs: bool = True
+
+    # Set to True on node classes whose output values must outlive the execution even when it releases the values
+    # nobody reads anymore. Single pins can be kept with Pin.retained instead. See node_editor.liveness
+    retain_outputs: bool = False
+
+    # Set to a number of seconds on node classes whose compute may hang or run away. A node still running after that
+    # long fails with NodeTimeout, and the execution goes on without it if it implements evaluate(), see
+    # node_editor.cancellation. Computes that loop should also call node_editor.cancellation.check() regularly, so they
+    # stop when the execution is cancelled or times out
+    timeout: Optional[float] = None
+
     def __init__(self) -> None:
         super().__init__()
         self._pins: List[Pin] = []
+        self._pins_by_name: Dict[str, Pin] = {}  # Filled by add_pin so get_pin is O(1)
+        self.exec_selection: Optional[List[str]] = None  # Set by select_exec_outputs, see node_editor.control_flow
 
     # Override me
     def init_widget(self) -> None:
         pass
 
-    def compute(self) -> None:
+    def compute(self) -> Any:
+        # May also be overridden with an `async def`, see execute_async
+        self.apply_outputs(self.evaluate(self.gather_inputs(), self.get_widget_state()))
+
+    @staticmethod
+    def evaluate(inputs: Dict[str, Any], widget_state: Any) -> Dict[str, Any]:
+        """
+        Computes the output values from the input values without touching the node. Override me.
+
+        Nodes that override this instead of compute can be run outside of the editor, such as in a worker process.
+
+        Args:
+            inputs: The values of the connected input pins, by pin name.
+            widget_state: The value returned by get_widget_state.
+
+        Returns:
+            The values of the output pins, by pin name.
+        """
         raise NotImplementedError("compute is not implemented")
 
-    def execute(self) -> None:
+    def gather_inputs(self) -> Dict[str, Any]:
+        """Returns the values of the input pins that have one, by pin name."""
+        return {
+            pin.name: pin.value
+            for pin in self._pins
+            if not pin.is_output and not pin.execution and hasattr(pin, "value")
+        }
+
+    def apply_outputs(self, outputs: Dict[str, Any]) -> None:
+        """Sets the output pins from a dictionary of values by pin name."""
+        for name, value in outputs.items():
+            pin = self.get_pin(name)
+            if pin:
+                pin.value = value
+
+    def select_exec_outputs(self, *names: str) -> None:
+        """
+        Chooses the exec output pins to fire once compute returns, in order. Call me from compute to branch.
+
+        When it isn't called, every exec output fires in the order the pins were added.
+        """
+        self.exec_selection = list(names)
+
+    def get_widget_state(self) -> Any:
+        """Returns the state of the node's widget that affects compute. Override me if the node has one.
+
+        The state is saved with the project, so it must be JSON serializable.
+        """
+        return None
+
+    def set_widget_state(self, state: Any) -> None:
+        """Restores the state returned by get_widget_state when a project is loaded. Override me."""
+        pass
+
+    def execute(self, bindings: Optional[Sequence[Tuple[Pin, Pin]]] = None) -> None:
         # Get the values from the input pins
-        self.execute_inputs()
+        with profiler.phase(self, "execute_inputs"):
+            self.execute_inputs(bindings)
 
         # Compute the value
-        self.compute()
+        with profiler.phase(self, "compute"):
+            if self.memoize:
+                self.compute_memoized()
+            else:
+                self.run_compute()
 
         # execute nodes connected to output
-        self.execute_outputs()
+        with profiler.phase(self, "execute_outputs"):
+            self.execute_outputs()
+
+    async def execute_async(self, bindings: Optional[Sequence[Tuple[Pin, Pin]]] = None) -> None:
+        """Same as execute, but awaits compute instead of blocking on it when it's a coroutine."""
+        with profiler.phase(self, "execute_inputs"):
+            self.execute_inputs(bindings)
+
+        # The wall time of compute includes the time spent waiting on other nodes while it awaits
+        with profiler.phase(self, "compute"):
+            key = memo.input_fingerprint(self) if self.memoize else None
+            if key is None or not self.restore_memoized(key):
+                result = self.compute()
+                if inspect.isawaitable(result):
+                    await result
+                if key is not None:
+                    self.store_memoized(key)
+
+        with profiler.phase(self, "execute_outputs"):
+            self.execute_outputs()
+
+    def run_compute(self) -> None:
+        """Calls compute. If it returns an awaitable (e.g. compute is an `async def`), it is run to completion."""
+        result = self.compute()
+        if inspect.isawaitable(result):
+            _run_to_completion(result)
+
+    def compute_memoized(self) -> None:
+        """Restores the output pin values from the class's memo cache, or computes and caches them on a miss."""
+        key = memo.input_fingerprint(self)
+        if key is None:  # The inputs can't be fingerprinted so there is nothing to cache against
+            self.run_compute()
+            return
+
+        if self.restore_memoized(key):
+            return
+
+        self.run_compute()
+        self.store_memoized(key)
+
+    def restore_memoized(self, key: str) -> bool:
+        """Sets the output pins from the memo cache, then from the disk cache. Returns False on a cache miss."""
+        outputs = memo.get_cache(type(self)).get(key)
+        if outputs is not None:
+            self.apply_outputs(outputs)
+            return True
+
+        outputs = disk_cache.load(self, key)
+        if outputs is None:
+            return False
+        self.apply_outputs(outputs)
+        self.store_memoized(key, persist=False)
+        return True
+
+    def store_memoized(self, key: str, persist: bool = True) -> None:
+        """Caches the values of the output pins in memory and, with `persist` set, in the disk cache."""
+        outputs = {pin.name: pin.value for pin in self._pins if pin.is_output and hasattr(pin, "value")}
+        if any(streaming.is_stream(value) for value in outputs.values()):
+            return  # A stream can only be consumed once so it can't be reused
+        if self.readonly_outputs:
+            # Cached buffers are handed out again on every hit, so nobody may mutate them
+            outputs = {name: buffers.freeze(value) for name, value in outputs.items()}
+        memo.get_cache(type(self)).put(key, outputs, memo.size_of(outputs))
+        if persist:
+            disk_cache.save(self, key, outputs)
+
+    def execute_inputs(self, bindings: Optional[Sequence[Tuple[Pin, Pin]]] = None) -> None:
+        """Pull values from connected output pins into this node's input pins.
+
+        Args:
+            bindings: The (input pin, output pin) pairs of this node, as resolved by an ExecutionPlan. When not given,
+                the connections of the pins are followed instead.
+        """
+        if bindings is not None:
+            for pin, other_pin in bindings:
+                if hasattr(other_pin, "value"):
+                    pin.value = streaming.read(other_pin.value, pin)
+            return
 
-    def execute_inputs(self) -> None:
-        """Pull values from connected output pins into this node's input pins."""
         for pin in self._pins:
             if pin.is_output:
                 continue
             if pin.connection:
                 other_pin = pin.connection.get_other_pin(pin)
                 if other_pin and hasattr(other_pin, "value"):
-                    pin.value = other_pin.value
+                    pin.value = streaming.read(other_pin.value, pin)
 
     def execute_outputs(self) -> None:
-        pass
+        """Publishes the values computed on the output pins."""
+        for pin in self._pins:
+            if not pin.is_output or not hasattr(pin, "value"):
+                continue
+            if self.readonly_outputs:
+                pin.value = buffers.freeze(pin.value)
+            # Large values are moved to disk when a spill store is enabled, see node_editor.spill. The store tracks
+            # the object it is given, so it must be the one that gets published
+            pin.value = spill.offload(pin.value)
+            if self.streaming and self.stream_buffer:
+                pin.value = streaming.buffered(pin.value, self.stream_buffer)
+            # A stream can only be consumed once, so every node it feeds gets a branch of its own
+            pin.value = streaming.split(pin.value, len(pin.connections))
+
+    def graph_model(self) -> Optional[GraphModel]:
+        """Returns the graph model of the scene holding the node, or None, e.g. when running headless."""
+        model: Optional[GraphModel] = getattr(self.scene(), "model", None)
+        return model if model is not None and model.has_node(self) else None
+
+    def get_downstream_nodes(self) -> List[Node]:
+        """Returns the nodes connected to this node's output pins."""
+        model = self.graph_model()
+        if model is not None:
+            return model.downstream(self)
+        nodes = []
+        for pin in self._pins:
+            if not pin.is_output:
+                continue
+            for other_pin in pin.get_other_pins():
+                if other_pin.node:
+                    nodes.append(other_pin.node)
+        return nodes
+
+    def get_upstream_nodes(self) -> List[Node]:
+        """Returns the nodes connected to this node's input pins."""
+        model = self.graph_model()
+        if model is not None:
+            return model.upstream(self)
+        nodes = []
+        for pin in self._pins:
+            if pin.is_output or not pin.connection:
+                continue
+            other_pin = pin.connection.get_other_pin(pin)
+            if other_pin and other_pin.node:
+                nodes.append(other_pin.node)
+        return nodes
+
+    def mark_dirty(self) -> None:
+        """
+        Marks this node and everything downstream of it as DIRTY so the next execution recomputes them.
+
+        The walk stops at nodes that are already DIRTY, since their downstream nodes are dirty too. This keeps
+        repeated edits cheap on large graphs.
+        """
+        self.set_status(Node_Status.DIRTY)
+        stack = self.get_downstream_nodes()
+        while stack:
+            node = stack.pop()
+            if node.status == Node_Status.DIRTY:
+                continue
+            node.set_status(Node_Status.DIRTY)
+            stack.extend(node.get_downstream_nodes())
+        self._notify_scene()
+
+    def _notify_scene(self) -> None:
+        # Lets the scene react to edits, e.g. to execute the graph again in live mode
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "node_changed"):
+            scene.node_changed(self)
 
     def delete(self) -> None:
         """Deletes the connection.
@@ -60,17 +341,18 @@ class Node(Node_Graphics):
             None
         """
 
-        to_delete = [pin.connection for pin in self._pins if pin.connection]
+        model = self.graph_model()
+        if model is not None:
+            to_delete = model.out_connections(self) + model.in_connections(self)
+        else:
+            to_delete = [connection for pin in self._pins for connection in pin.connections.values()]
         for connection in to_delete:
             connection.delete()
 
         self.scene().removeItem(self)
 
     def get_pin(self, name: str) -> Optional[Pin]:
-        for pin in self._pins:
-            if pin.name == name:
-                return pin
-        return None
+        return self._pins_by_name.get(name)
 
     def add_pin(self, name: str, is_output: bool, execution: bool = False) -> None:
         """
@@ -94,6 +376,7 @@ class Node(Node_Graphics):
         pin.set_execution(execution)
 
         self._pins.append(pin)
+        self._pins_by_name.setdefault(name, pin)  # Like a scan of the pins, the first pin with the name wins
 
     def select_connections(self, value: bool) -> None:
         """
@@ -112,6 +395,6 @@ class Node(Node_Graphics):
         """
 
         for pin in self._pins:
-            if pin.connection:
-                pin.connection._do_highlight = value
-                pin.connection.update_path()
+            for connection in pin.connections.values():
+                connection._do_highlight = value
+                connection.update_path()
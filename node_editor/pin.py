@@ -1,19 +1,56 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 
-from node_editor.gui.pin_graphics import Pin_Graphics
+from node_editor.common import is_headless
+from node_editor.compute_graph import execute_upstream
+
+if not is_headless():
+    from node_editor.gui.pin_graphics import Pin_Graphics
+else:
+    from node_editor.headless import Pin_Graphics  # type: ignore
 
 
 class Pin(Pin_Graphics):
+    # Pins are by far the most numerous objects of a graph. Headless, the slots leave them without a __dict__, see
+    # node_editor.headless. Editor pins are QGraphicsItems and keep theirs. The value slot is left unset until the pin
+    # receives a value, which is what hasattr(pin, "value") checks
+    __slots__ = ("node", "value", "retained")
+
     def __init__(self, parent: Any, scene: Any) -> None:
         super().__init__(parent, scene)
 
         self.name: str = ""
         self.node: Optional[Any] = None
-        self.connection: Optional[Any] = None
+        # The connections of the pin, by id so they can be added and removed in O(1) while keeping their order.
+        # An input pin has at most one connection, an output pin can feed any number of inputs
+        self.connections: Dict[int, Any] = {}
         self.execution: bool = False
+        # Keeps the pin's value when an execution releases the values nobody reads anymore. See node_editor.liveness
+        self.retained: bool = False
+
+    @property
+    def connection(self) -> Optional[Any]:
+        """The first connection of the pin, which is the only one for input pins."""
+        return next(iter(self.connections.values()), None)
+
+    def add_connection(self, connection: Any) -> None:
+        self.connections[id(connection)] = connection
+
+    def remove_connection(self, connection: Any) -> None:
+        self.connections.pop(id(connection), None)
+
+    def get_other_pins(self) -> List[Pin]:
+        """Returns the pins at the other end of the pin's connections."""
+        pins = []
+        for connection in self.connections.values():
+            other_pin = connection.get_other_pin(self)
+            if other_pin is not None:
+                pins.append(other_pin)
+        return pins
 
     def set_execution(self, execution: bool) -> None:
         self.execution = execution
@@ -23,9 +60,25 @@ class Pin(Pin_Graphics):
         self.name = name
         super().set_name(name)
 
+    def set_value(self, value: Any) -> None:
+        """
+        Sets the pin's value from outside of an execution and marks the affected nodes DIRTY.
+
+        For an input pin the owning node needs recomputing. For an output pin only the nodes it feeds do.
+        """
+        self.value = value
+        if not self.is_output:
+            if self.node:
+                self.node.mark_dirty()
+        else:
+            for other_pin in self.get_other_pins():
+                if other_pin.node:
+                    other_pin.node.mark_dirty()
+
     def clear_connection(self) -> None:
-        if self.connection:
-            self.connection.delete()
+        """Deletes all of the pin's connections."""
+        for connection in list(self.connections.values()):
+            connection.delete()
 
     def can_connect_to(self, pin: Optional[Pin]) -> bool:
         if not pin:
@@ -36,31 +89,26 @@ class Pin(Pin_Graphics):
         return self.is_output != pin.is_output
 
     def is_connected(self) -> bool:
-        return bool(self.connection)
+        return bool(self.connections)
 
     def get_data(self) -> Any:
-        pass
-        # Get a list of nodes in the order to be computed. Forward evaluation by default.
-        # def get_node_compute_order(node, forward=False):
-        # Create a set to keep track of visited nodes
-        # visited = set()
-        # Create a stack to keep track of nodes to visit
-        # stack = [node]
-        # Create a list to store the evaluation order
-        # order = []
-
-        # Get the next nodes that this node is dependent on
-        # def get_next_input_node(node):
-        #   pass
-
-        # Get the next nodes that is affected by the input node.
-        # def get_next_output_node(node):
-        #    pass
-
-        # if pin isn't connected, return it current data
-
-        # get the evalutation order of the owning node of the pin
-
-        # loop over each node and process it
-
-        # return the pin's data
+        """
+        Returns the pin's value, computing whatever is needed to bring it up to date first.
+
+        Evaluation is demand driven: only the ancestors of the pin are executed, and the ones that are still CLEAN
+        are reused. An input pin returns the data of the output pin it is connected to, or its current value if it
+        isn't connected.
+
+        Raises:
+            CycleError: If the ancestors of the pin contain a cycle.
+        """
+        if not self.is_output:
+            if self.connection:
+                other_pin = self.connection.get_other_pin(self)
+                if other_pin:
+                    return other_pin.get_data()
+            return getattr(self, "value", None)
+
+        if self.node:
+            execute_upstream(self.node)
+        return getattr(self, "value", None)
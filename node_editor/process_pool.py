@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from node_editor import buffers
+from node_editor import memo
+from node_editor import profiler
+from node_editor import transport
+from node_editor.cancellation import CancelToken
+from node_editor.cancellation import NodeTimeout
+from node_editor.executors import finish_node
+from node_editor.executors import needs_execution
+from node_editor.executors import run_node
+from node_editor.executors import stop_if_cancelled
+from node_editor.executors import timeout_of
+from node_editor.executors import upstream_failed
+from node_editor.liveness import Liveness
+
+if TYPE_CHECKING:
+    from node_editor.compute_graph import ExecutionPlan
+
+# Identifies a node class in a way that can be sent to a worker: (module file, module name, class name)
+ClassRef = Tuple[str, str, str]
+
+# Worker side
+
+_worker_classes: Dict[ClassRef, Any] = {}
+
+
+def _init_worker(sys_path: List[str]) -> None:
+    # Make the project packages (e.g. Example_Project.common_widgets) importable the same way they are in the editor
+    for path in sys_path:
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def _load_class(class_ref: ClassRef) -> Any:
+    node_class = _worker_classes.get(class_ref)
+    if node_class is not None:
+        return node_class
+
+    module_file, module_name, class_name = class_ref
+    module = sys.modules.get(module_name)
+    if module is None or getattr(module, "__file__", None) != module_file:
+        # Node modules are loaded from their file by NodeEditor.load_project, so load them the same way here
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Could not load spec for {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+    node_class = getattr(module, class_name)
+    _worker_classes[class_ref] = node_class
+    return node_class
+
+
+# (pid, start, wall time, CPU time) of an evaluate() in a worker, in nanoseconds. See node_editor.profiler
+Timing = Tuple[int, int, int, int]
+
+
+def _evaluate(
+    class_ref: ClassRef, inputs: Dict[str, Any], widget_state: Any, threshold: Optional[int]
+) -> Tuple[Dict[str, Any], Timing]:
+    node_class = _load_class(class_ref)
+    transport.collect_retired()
+    inputs, segments = transport.receive_inputs(inputs)
+    result: Dict[str, Any] = {}
+    try:
+        cpu = time.process_time_ns()
+        start = time.perf_counter_ns()
+        result = node_class.evaluate(inputs, widget_state)
+        timing = (os.getpid(), start, time.perf_counter_ns() - start, time.process_time_ns() - cpu)
+        if threshold is not None:
+            return transport.share_outputs(result, threshold), timing
+        return result, timing
+    finally:
+        # Drop the views into the input segments, which the outputs may be, so the segments can be unmapped
+        inputs.clear()
+        result = {}
+        for segment in segments:
+            transport.close(segment)
+
+
+# Editor side
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers: Optional[int] = None
+# The jobs of nodes that timed out and are still running. Their workers may never be done, see shutdown_pool
+_abandoned: Set[Future[Tuple[Dict[str, Any], Timing]]] = set()
+
+
+def get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Returns the shared worker pool, starting it on first use.
+
+    Workers are spawned rather than forked so they don't inherit the editor's Qt state. The pool is kept alive
+    between executions since starting workers is slow.
+    """
+    global _pool, _pool_workers
+    if _pool is not None and _pool_workers != max_workers:
+        shutdown_pool()
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(list(sys.path),),
+        )
+        _pool_workers = max_workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Stops the worker pool without waiting for it. Workers still running the job of a node that timed out are
+    terminated, since that job may never end.
+    """
+    global _pool, _pool_workers
+    pool = _pool
+    _pool = None
+    _pool_workers = None
+    if pool is None:
+        return
+
+    # The done callbacks of the futures discard them from the pool's thread
+    abandoned = any(not future.done() for future in list(_abandoned))
+    _abandoned.clear()
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+, also shuts the pool down
+    if abandoned and terminate is not None:
+        terminate()
+        return
+
+    processes = list((getattr(pool, "_processes", None) or {}).values())  # Cleared by shutdown
+    pool.shutdown(wait=False, cancel_futures=True)
+    if abandoned:
+        for process in processes:
+            process.terminate()
+
+
+def class_ref(node_class: type) -> ClassRef:
+    return (inspect.getfile(node_class), node_class.__module__, node_class.__name__)
+
+
+def _discard_result(future: Future[Tuple[Dict[str, Any], Timing]]) -> None:
+    # The result of a node that timed out arrives after the execution moved on without it
+    _abandoned.discard(future)
+    if future.cancelled() or future.exception() is not None:
+        return
+    outputs, _ = future.result()
+    transport.discard(outputs)
+
+
+def execute_processes(
+    plan: ExecutionPlan,
+    only_dirty: bool = True,
+    max_workers: Optional[int] = None,
+    shared_memory_threshold: Optional[int] = transport.DEFAULT_THRESHOLD,
+    release_values: bool = False,
+    cancel: Optional[CancelToken] = None,
+    node_timeout: Optional[float] = None,
+) -> None:
+    """
+    Executes the nodes, running the ones marked `process_safe` in worker processes.
+
+    A process safe node has its inputs pulled on the calling thread, then its evaluate() runs in a worker and the
+    returned values are set on its output pins. The node itself never leaves this process. Other nodes run on the
+    calling thread while the workers are busy. Each node is dispatched as soon as its upstream nodes are done.
+
+    Array and buffer values of at least `shared_memory_threshold` bytes travel between the editor and the workers
+    in shared memory instead of being pickled, see node_editor.transport. A segment is freed when the last node
+    downstream of the one that produced it is done.
+
+    Args:
+        plan: The compiled graph to execute.
+        only_dirty: Skip CLEAN nodes whose upstream nodes didn't run.
+        max_workers: The number of worker processes. Defaults to the number of CPUs.
+        shared_memory_threshold: The size in bytes from which values are sent through shared memory, or None to
+            always pickle them.
+        release_values: Drop every intermediate value as soon as the last node reading it is done, see
+            node_editor.liveness.
+        cancel, node_timeout: See node_editor.executors.execute_threaded. A worker process running a node that timed
+            out keeps running it until it is done, the result is then dropped, or until shutdown_pool terminates it.
+
+    Raises:
+        Cancelled: If the execution was cancelled.
+    """
+    nodes, schedule = plan.nodes, plan.schedule
+    pool = get_pool(max_workers)
+    remaining = schedule.in_degrees()
+    executed = [False] * len(nodes)
+    failed = [False] * len(nodes)
+    ready: Deque[int] = deque(v for v in range(len(nodes)) if remaining[v] == 0)
+    pending: Dict[Future[Tuple[Dict[str, Any], Timing]], Tuple[int, Optional[str]]] = {}
+    # The (deadline, timeout) of the pending nodes that have a timeout
+    deadlines: Dict[Future[Tuple[Dict[str, Any], Timing]], Tuple[float, float]] = {}
+    segments = transport.SegmentRegistry(shared_memory_threshold) if shared_memory_threshold is not None else None
+    transport.collect_retired()
+    liveness = Liveness(plan) if release_values else None
+
+    def complete(node_index: int) -> None:
+        if liveness is not None:
+            liveness.done(node_index)
+        if segments is not None:
+            segments.release(node_index)
+        for successor in schedule.successors[node_index]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+
+    try:
+        while ready or pending:
+            stop_if_cancelled(cancel, ready, pending)
+            while ready:
+                node_index = ready.popleft()
+                node = nodes[node_index]
+                if upstream_failed(node_index, nodes, schedule, failed) or (
+                    only_dirty and not needs_execution(node_index, nodes, schedule, executed)
+                ):
+                    complete(node_index)
+                    continue
+
+                executed[node_index] = True
+                timeout = timeout_of(node, node_timeout)
+                if not node.process_safe:
+                    error: Optional[Exception] = run_node(node, plan.bindings[node_index], timeout, cancel)
+                    failed[node_index] = error is not None
+                    finish_node(node, error)
+                    if segments is not None:
+                        values = [pin.value for pin in node._pins if pin.is_output and hasattr(pin, "value")]
+                        segments.hold_views(values, set(schedule.successors[node_index]))
+                    complete(node_index)
+                    continue
+
+                print(f"\n--- Executing Node {node.index} ({node.__class__.__name__}) in a worker process ---")
+                with profiler.phase(node, "execute_inputs"):
+                    node.execute_inputs(plan.bindings[node_index])
+                key = memo.input_fingerprint(node) if node.memoize else None
+                if key is not None and node.restore_memoized(key):
+                    with profiler.phase(node, "execute_outputs"):
+                        node.execute_outputs()
+                    finish_node(node, None)
+                    complete(node_index)
+                    continue
+
+                try:
+                    inputs = node.gather_inputs()
+                    if segments is not None:
+                        inputs = segments.share_inputs(inputs, node_index)
+                    inputs = {name: buffers.picklable(value) for name, value in inputs.items()}
+                    future = pool.submit(
+                        _evaluate, class_ref(type(node)), inputs, node.get_widget_state(), shared_memory_threshold
+                    )
+                except Exception as e:
+                    print(f"Error executing node {node.index}: {e}")
+                    failed[node_index] = True
+                    finish_node(node, e)
+                    complete(node_index)
+                    continue
+                pending[future] = (node_index, key)
+                if timeout is not None:
+                    deadlines[future] = (time.monotonic() + timeout, timeout)
+
+            if not pending:
+                continue
+
+            wait_time = None
+            if deadlines:
+                wait_time = max(0.0, min(deadline for deadline, _ in deadlines.values()) - time.monotonic())
+            done, _ = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for future, (deadline, timeout) in list(deadlines.items()):
+                if future not in pending:
+                    del deadlines[future]  # Cancelled before it started
+                    continue
+                if future in done or now < deadline:
+                    continue
+                # Worker processes can't be interrupted, the node fails and its result is dropped when it arrives
+                del deadlines[future]
+                node_index, _ = pending.pop(future)
+                node = nodes[node_index]
+                print(f"Node {node.index} ({node.__class__.__name__}) timed out after {timeout:g} seconds")
+                _abandoned.add(future)
+                future.add_done_callback(_discard_result)
+                failed[node_index] = True
+                finish_node(node, NodeTimeout(timeout))
+                complete(node_index)
+
+            for future in done:
+                deadlines.pop(future, None)
+                node_index, key = pending.pop(future)
+                node = nodes[node_index]
+                error = None
+                try:
+                    outputs, (pid, start, wall, cpu) = future.result()
+                    if segments is not None:
+                        outputs = segments.receive_outputs(outputs, set(schedule.successors[node_index]))
+                    active = profiler.get_profiler()
+                    if active is not None:
+                        active.record(node, "compute", start, wall, cpu, pid=pid, thread="MainThread")
+                    node.apply_outputs(outputs)
+                    if key is not None:
+                        node.store_memoized(key)
+                    with profiler.phase(node, "execute_outputs"):
+                        node.execute_outputs()
+                except Exception as e:
+                    print(f"Error executing node {node.index}: {e}")
+                    error = e
+                failed[node_index] = error is not None
+                finish_node(node, error)
+                complete(node_index)
+    finally:
+        if segments is not None:
+            # Nodes that failed to be dispatched or raised may still hold references
+            segments.release_all()
+
+    if cancel is not None:
+        cancel.check()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any
+from typing import ContextManager
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from node_editor.node import Node
+
+# The profiler records how long each node spends in each phase of its execution, so a slow graph can be traced back
+# to the nodes responsible. Recording a phase costs a couple of clock reads and an append to a bounded buffer, and
+# nothing at all while no profiler is active, so it can be left enabled.
+#
+#     profiler = node_editor.profiler.enable()
+#     compute_dag_nodes(nodes, connections)
+#     print(profiler.format_summary())
+#     profiler.export_chrome_trace("trace.json")  # Open in chrome://tracing or https://ui.perfetto.dev
+
+SUMMARY_COLUMNS = (
+    "node",
+    "class",
+    "runs",
+    "inputs_ms",
+    "compute_ms",
+    "outputs_ms",
+    "total_ms",
+    "cpu_ms",
+    "bytes_in",
+    "bytes_out",
+    "where",
+)
+
+
+class Span:
+    """The timing of one phase of one node execution. Times are in nanoseconds of time.perf_counter_ns."""
+
+    __slots__ = ("run", "node", "node_class", "phase", "start", "wall", "cpu", "bytes", "pid", "thread")
+
+    def __init__(
+        self,
+        run: int,
+        node: str,
+        node_class: str,
+        phase: str,
+        start: int,
+        wall: int,
+        cpu: int,
+        bytes: int,
+        pid: int,
+        thread: str,
+    ) -> None:
+        self.run = run
+        self.node = node
+        self.node_class = node_class
+        self.phase = phase
+        self.start = start
+        self.wall = wall
+        self.cpu = cpu
+        self.bytes = bytes
+        self.pid = pid
+        self.thread = thread
+
+
+def value_size(value: Any) -> int:
+    """
+    Cheaply approximates the size in bytes of a value moved between pins.
+
+    Buffers (NumPy arrays, bytes...) report their actual size, other objects their shallow size. Values are never
+    serialized to measure them, so containers are undercounted.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return sys.getsizeof(value)
+    except TypeError:
+        return 0
+
+
+def _pins_size(node: Node, outputs: bool) -> int:
+    return sum(
+        value_size(pin.value)
+        for pin in node._pins
+        if pin.is_output == outputs and not pin.execution and hasattr(pin, "value")
+    )
+
+
+class Profiler:
+    """
+    Records the wall time, CPU time, bytes moved and the thread or process of each node execution phase.
+
+    Attributes:
+        spans (Deque[Span]): The recorded spans, oldest first. Only the last `max_spans` are kept.
+        run (int): The number of the current execution of the graph, incremented by start_run.
+    """
+
+    def __init__(self, max_spans: int = 100_000) -> None:
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.run = 0
+        self._origin = time.perf_counter_ns()
+
+    def start_run(self) -> None:
+        """Called at the start of every execution of a graph so spans can be told apart by run."""
+        self.run += 1
+
+    def clear(self) -> None:
+        self.spans.clear()
+        self.run = 0
+
+    def record(
+        self,
+        node: Node,
+        phase: str,
+        start: int,
+        wall: int,
+        cpu: int,
+        bytes: int = 0,
+        pid: Optional[int] = None,
+        thread: Optional[str] = None,
+    ) -> None:
+        """Records a span. Defaults to the current process and thread."""
+        self.spans.append(
+            Span(
+                self.run,
+                str(node.index),
+                node.__class__.__name__,
+                phase,
+                start,
+                wall,
+                cpu,
+                bytes,
+                os.getpid() if pid is None else pid,
+                threading.current_thread().name if thread is None else thread,
+            )
+        )
+
+    def phase(self, node: Node, phase: str) -> ContextManager[None]:
+        """Times the body of the with statement as the given phase of the node's execution."""
+        return _PhaseTimer(self, node, phase)
+
+    def summary(self, sort_by: str = "total_ms", run: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregates the spans by node into rows with the SUMMARY_COLUMNS, slowest first.
+
+        Args:
+            sort_by: The column to sort by. Numeric columns are sorted in descending order, the others ascending.
+            run: Only include the spans of this run. Defaults to every recorded run.
+        """
+        if sort_by not in SUMMARY_COLUMNS:
+            raise ValueError(f"Unknown summary column: {sort_by}")
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        runs: Dict[str, Set[int]] = {}
+        for span in self.spans:
+            if run is not None and span.run != run:
+                continue
+            row = rows.get(span.node)
+            if row is None:
+                row = dict.fromkeys(SUMMARY_COLUMNS, 0)
+                row.update(node=span.node, **{"class": span.node_class}, where=set())
+                rows[span.node] = row
+                runs[span.node] = set()
+            runs[span.node].add(span.run)
+
+            ms = span.wall / 1e6
+            if span.phase == "execute_inputs":
+                row["inputs_ms"] += ms
+                row["bytes_in"] += span.bytes
+            elif span.phase == "execute_outputs":
+                row["outputs_ms"] += ms
+                row["bytes_out"] += span.bytes
+            else:
+                row["compute_ms"] += ms
+            row["total_ms"] += ms
+            row["cpu_ms"] += span.cpu / 1e6
+            row["where"].add(span.thread if span.pid == os.getpid() else f"pid {span.pid}")
+
+        for node, row in rows.items():
+            row["runs"] = len(runs[node])
+            row["where"] = ", ".join(sorted(row["where"]))
+
+        descending = sort_by not in ("node", "class", "where")
+        return sorted(rows.values(), key=lambda row: row[sort_by], reverse=descending)
+
+    def format_summary(self, sort_by: str = "total_ms", run: Optional[int] = None) -> str:
+        """Formats the summary as a plain text table."""
+        table = [list(SUMMARY_COLUMNS)]
+        for row in self.summary(sort_by, run):
+            table.append([f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c]) for c in SUMMARY_COLUMNS])
+
+        widths = [max(len(line[i]) for line in table) for i in range(len(SUMMARY_COLUMNS))]
+        return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in table)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans as Chrome trace-event JSON, one complete event per span."""
+        events: List[Dict[str, Any]] = []
+        threads: Dict[str, int] = {}
+        for span in self.spans:
+            tid = threads.setdefault(f"{span.pid}:{span.thread}", len(threads) + 1)
+            events.append(
+                {
+                    "name": f"{span.node_class} {span.node}",
+                    "cat": span.phase,
+                    "ph": "X",
+                    "ts": (span.start - self._origin) / 1000,
+                    "dur": span.wall / 1000,
+                    "pid": span.pid,
+                    "tid": tid,
+                    "args": {"run": span.run, "phase": span.phase, "cpu_ms": span.cpu / 1e6, "bytes": span.bytes},
+                }
+            )
+        for key, tid in threads.items():
+            pid, _, name = key.partition(":")
+            events.append({"name": "thread_name", "ph": "M", "pid": int(pid), "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _PhaseTimer:
+    __slots__ = ("profiler", "node", "phase", "start", "cpu")
+
+    def __init__(self, profiler: Profiler, node: Node, phase: str) -> None:
+        self.profiler = profiler
+        self.node = node
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        self.cpu = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall = time.perf_counter_ns() - self.start
+        cpu = time.thread_time_ns() - self.cpu
+        moved = 0
+        if self.phase == "execute_inputs":
+            moved = _pins_size(self.node, outputs=False)
+        elif self.phase == "execute_outputs":
+            moved = _pins_size(self.node, outputs=True)
+        self.profiler.record(self.node, self.phase, self.start, wall, cpu, moved)
+
+
+_active: Optional[Profiler] = None
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """Starts recording node executions, with a new profiler unless one is given. Returns the active profiler."""
+    global _active
+    _active = profiler if profiler is not None else Profiler()
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    """Stops recording. Returns the profiler that was active so its results can still be read."""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _active
+
+
+def start_run() -> None:
+    if _active is not None:
+        _active.start_run()
+
+
+_NO_TIMING = nullcontext()
+
+
+def phase(node: Node, name: str) -> ContextManager[None]:
+    """Times a phase of a node's execution with the active profiler. Does nothing if profiling is disabled."""
+    if _active is None:
+        return _NO_TIMING
+    return _active.phase(node, name)
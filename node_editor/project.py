@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import importlib.util
+import inspect
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from node_editor.connection import Connection
+    from node_editor.node import Node
+
+
+def load_node_modules(project_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Imports the `*_node.py` modules of a project.
+
+    Returns:
+        The node classes found in the modules, by class name, as {"class": class, "module": module} dictionaries.
+    """
+    imports: Dict[str, Dict[str, Any]] = {}
+
+    for file in project_path.glob("*.py"):
+        if not file.stem.endswith("_node"):
+            logging.debug(f"Skipping file: {file.stem}")
+            continue
+
+        try:
+            spec = importlib.util.spec_from_file_location(file.stem, file)
+            if spec and spec.loader:
+                module = importlib.util.module_from_spec(spec)
+                # Registered so the node classes can be located by module, e.g. from worker processes
+                sys.modules[file.stem] = module
+                spec.loader.exec_module(module)
+            else:
+                logging.warning(f"Could not load spec for {file}")
+                continue
+        except Exception as e:
+            logging.error(f"Failed to import {file.name}: {e}")
+            continue
+
+        for name, obj in inspect.getmembers(module):
+            if name.endswith("_Node") and inspect.isclass(obj):
+                imports[obj.__name__] = {"class": obj, "module": module}
+
+    return imports
+
+
+def load_graph(json_path: Path, imports: Dict[str, Dict[str, Any]]) -> Tuple[List[Node], List[Connection]]:
+    """
+    Builds the nodes and connections saved by NodeWidget.save_project, without adding them to a scene.
+
+    Nodes of an unknown type are skipped, along with their connections.
+    """
+    from node_editor.connection import Connection
+
+    with open(json_path) as f:
+        data = json.load(f)
+
+    node_lookup: Dict[str, Node] = {}
+    for node in data["nodes"]:
+        try:
+            info = imports[node["type"]]
+        except KeyError:
+            logging.warning(f"Unknown node type: {node['type']}")
+            continue
+        node_item = info["class"]()
+        node_item.index = node["index"]
+        if "state" in node:
+            node_item.set_widget_state(node["state"])
+        node_lookup[str(node["index"])] = node_item
+
+    connections = []
+    for c in data["connections"]:
+        try:
+            start_pin = node_lookup[str(c["start_id"])].get_pin(c["start_pin"])
+            end_pin = node_lookup[str(c["end_id"])].get_pin(c["end_pin"])
+        except KeyError:  # Node might be missing so we skip it
+            continue
+        if not start_pin or not end_pin:
+            continue
+
+        connection = Connection(None)
+        connection.set_start_pin(start_pin)
+        connection.set_end_pin(end_pin)
+        connection.update_start_and_end_pos()
+        connections.append(connection)
+
+    return list(node_lookup.values()), connections
@@ -0,0 +1,186 @@
+"""
+Runs a saved graph without the editor GUI.
+
+Usage:
+    python -m node_editor.run graph.json [--project DIR] [--mode serial] [--workers N] [--batch columns.json]
+        [--trigger NODE] [--profile trace.json] [--release-values] [--memory-budget MB] [--spill-threshold MB]
+        [--cache [DIR]] [--checkpoint DIR]
+
+The node modules are loaded from the project folder, which defaults to the folder of the graph. Node, Pin and
+Connection are swapped for their Qt-free stand-ins so PySide6's GUI modules are never imported by the framework.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Must be set before node_editor.node is imported, by us or by the node modules
+    os.environ["NODE_EDITOR_HEADLESS"] = "1"
+
+    from node_editor import checkpoint
+    from node_editor import disk_cache
+    from node_editor import profiler
+    from node_editor import spill
+    from node_editor.batch import execute_batch
+    from node_editor.batch import make_columns
+    from node_editor.common import Node_Status
+    from node_editor.compute_graph import CycleError
+    from node_editor.compute_graph import execute_plan
+    from node_editor.compute_graph import EXECUTION_MODES
+    from node_editor.compute_graph import ExecutionPlan
+    from node_editor.control_flow import run_exec
+    from node_editor.process_pool import shutdown_pool
+    from node_editor.project import load_graph
+    from node_editor.project import load_node_modules
+
+    parser = argparse.ArgumentParser(prog="python -m node_editor.run", description="Execute a saved node graph.")
+    parser.add_argument("graph", type=Path, help="The .json graph saved by the editor")
+    parser.add_argument("--project", type=Path, help="The folder with the *_node.py modules")
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default="serial", help="The execution mode")
+    parser.add_argument("--workers", type=int, help="The number of workers for the parallel modes")
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help='Run the graph over a batch. A .json file of {"<node index>:<output pin>": [values, ...]} columns',
+    )
+    parser.add_argument(
+        "--trigger",
+        help="The index of a node to fire, e.g. a button. Only the nodes its exec outputs lead to are executed",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help="Profile the nodes, print a summary table and write a Chrome trace (chrome://tracing) to this file",
+    )
+    parser.add_argument(
+        "--release-values",
+        action="store_true",
+        help="Drop intermediate values as soon as they are no longer needed, keeping only the graph's results",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Spill arrays and buffers to memory mapped temporary files once the values in memory exceed this size",
+    )
+    parser.add_argument(
+        "--spill-threshold",
+        type=int,
+        metavar="MB",
+        help="Spill every array or buffer of at least this size to a memory mapped temporary file",
+    )
+    parser.add_argument(
+        "--spill-dir", type=Path, help="The folder to write spill files to, defaults to the temp folder"
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        nargs="?",
+        const=True,
+        help="Reuse the outputs of memoized nodes across runs, stored in this folder or in the project's "
+        f"{disk_cache.PROJECT_CACHE_DIR} folder",
+    )
+    parser.add_argument("--cache-size", type=int, metavar="MB", help="The maximum size of the cache")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        metavar="DIR",
+        help="Save every node's outputs to this folder as it finishes, and resume from there if the last run failed",
+    )
+    parser.add_argument(
+        "--node-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Fail the nodes that run longer than this, unless their class sets a timeout of its own",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    project_path: Path = (args.project or args.graph.parent).resolve()
+    if not project_path.is_dir():
+        logging.error(f"Invalid project path: {project_path}")
+        return 2
+
+    # Node modules import their project as a package, e.g. Example_Project.common_widgets
+    sys.path.insert(0, str(project_path.parent))
+
+    imports = load_node_modules(project_path)
+    nodes, connections = load_graph(args.graph, imports)
+
+    if args.profile:
+        profiler.enable()
+    if args.cache is not None:
+        cache_path = project_path / disk_cache.PROJECT_CACHE_DIR if args.cache is True else args.cache
+        max_bytes = args.cache_size * 1024 * 1024 if args.cache_size is not None else disk_cache.DEFAULT_MAX_BYTES
+        disk_cache.enable(str(cache_path), max_bytes)
+    if args.memory_budget is not None or args.spill_threshold is not None:
+        mb = 1024 * 1024
+        spill.enable(
+            spill.SpillStore(
+                budget=args.memory_budget * mb if args.memory_budget is not None else spill.DEFAULT_BUDGET,
+                threshold=args.spill_threshold * mb if args.spill_threshold is not None else spill.DEFAULT_THRESHOLD,
+                directory=str(args.spill_dir) if args.spill_dir else None,
+            )
+        )
+
+    try:
+        plan = ExecutionPlan(nodes, connections)
+        if args.trigger is not None:
+            triggers = [node for node in nodes if str(node.index) == args.trigger]
+            if not triggers:
+                logging.error(f"No node with index {args.trigger}")
+                return 2
+            run_exec(triggers[0], node_timeout=args.node_timeout)
+        elif args.batch:
+            try:
+                with open(args.batch) as f:
+                    columns = make_columns(plan, json.load(f))
+                execute_batch(plan, columns)
+            except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                message = e.args[0] if isinstance(e, KeyError) and e.args else e
+                logging.error(f"Invalid batch file {args.batch}: {message}")
+                return 2
+        elif args.checkpoint:
+            checkpoint.execute_checkpointed(
+                plan,
+                str(args.checkpoint),
+                mode=args.mode,
+                max_workers=args.workers,
+                release_values=args.release_values,
+                node_timeout=args.node_timeout,
+            )
+        else:
+            execute_plan(
+                plan,
+                mode=args.mode,
+                max_workers=args.workers,
+                release_values=args.release_values,
+                node_timeout=args.node_timeout,
+            )
+    except CycleError as e:
+        logging.error(f"Can't execute graph: {e}")
+        return 1
+    finally:
+        shutdown_pool()
+        spill.disable()
+        active = profiler.disable()
+        if active is not None:
+            print(active.format_summary())
+            active.export_chrome_trace(str(args.profile))
+
+    return 1 if any(node.status == Node_Status.ERROR for node in nodes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
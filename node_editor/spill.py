@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import atexit
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from types import ModuleType
+from typing import Any
+from typing import Optional
+from typing import Set
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only bytes-like values are spilled without it
+    np = None
+
+# Pin values normally live in memory, which caps the size of a graph's intermediates at the RAM of the machine. With
+# a spill store enabled, the arrays and byte buffers published on output pins are written to temporary files and
+# replaced by read-only memory mapped views of them when:
+# - a single value is at least `threshold` bytes, or
+# - keeping it in memory would take the values held in memory over `budget` bytes.
+#
+# Consumers read a spilled NumPy array as a read-only numpy.memmap, and a spilled byte buffer as a read-only
+# memoryview of an mmap. The OS pages them in and out as they are read, so they can be larger than RAM. Byte buffers
+# kept in memory are also published as memoryviews, of themselves, since that is how the store tracks when they are
+# released.
+#
+# A spill file is deleted as soon as nothing maps it anymore, and the store's folder is removed when the store is
+# disabled (at the end of a run, when the editor closes, or when the interpreter exits).
+
+DEFAULT_THRESHOLD = 256 * 1024 * 1024
+DEFAULT_BUDGET = 1024 * 1024 * 1024
+
+
+def _size(value: Any) -> Optional[int]:
+    # The size of a value that can be spilled, None for anything else
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype.hasobject or isinstance(value, np.memmap):
+            return None
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview) and not isinstance(value.obj, mmap.mmap):
+        return value.nbytes
+    return None
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Still mapped on Windows, the folder is removed with the store
+
+
+class SpillStore:
+    """
+    Spills large pin values to memory mapped temporary files.
+
+    Args:
+        budget: The number of bytes of spillable values that are kept in memory before new ones get spilled.
+        threshold: The size in bytes from which a value is always spilled.
+        directory: The folder to create the store's temporary folder in. Defaults to the system's temp folder.
+    """
+
+    def __init__(
+        self, budget: int = DEFAULT_BUDGET, threshold: int = DEFAULT_THRESHOLD, directory: Optional[str] = None
+    ) -> None:
+        self.budget = budget
+        self.threshold = threshold
+        self.path: Optional[str] = tempfile.mkdtemp(prefix="node_editor_spill_", dir=directory)
+        self.in_memory = 0  # The bytes of the values kept in memory that are still alive
+        self.spilled = 0  # The number of values spilled
+        self._count = 0
+        self._tracked: Set[int] = set()  # The ids of the values counted in in_memory
+        # Pins are published from worker threads in the threaded mode
+        self._lock = threading.Lock()
+
+    def offload(self, value: Any) -> Any:
+        """
+        Returns the value, or a memory mapped view of it if it has to be spilled. bytes and bytearrays are returned as
+        memoryviews either way.
+
+        A value kept in memory is counted until the returned object is collected, so call me on the value as it is
+        published, e.g. after node_editor.buffers.freeze.
+        """
+        nbytes = _size(value)
+        if nbytes is None or nbytes == 0:
+            return value
+
+        with self._lock:
+            if self.path is None or id(value) in self._tracked:
+                return value  # Closed, or published again (e.g. from the memo cache) and already counted
+            keep = nbytes < self.threshold and self.in_memory + nbytes <= self.budget
+            if keep:
+                if isinstance(value, (bytes, bytearray)):
+                    # They can't be weakly referenced, so track a view of them instead
+                    value = memoryview(value)
+                # Values are released when the pins holding them drop them, e.g. see node_editor.liveness
+                weakref.finalize(value, self._forget, id(value), nbytes)
+                self._tracked.add(id(value))
+                self.in_memory += nbytes
+                return value
+            self._count += 1
+            path = os.path.join(self.path, f"{self._count}.bin")
+            self.spilled += 1
+
+        return self._spill(value, path)
+
+    def _forget(self, key: int, nbytes: int) -> None:
+        with self._lock:
+            self._tracked.discard(key)
+            self.in_memory -= nbytes
+
+    def _spill(self, value: Any, path: str) -> Any:
+        if np is not None and isinstance(value, np.ndarray):
+            target = np.lib.format.open_memmap(path, mode="w+", dtype=value.dtype, shape=value.shape)
+            target[...] = value
+            target.flush()
+            del target
+            mapped = np.load(path, mmap_mode="r")
+            weakref.finalize(mapped, _remove, path)
+            return mapped
+
+        with open(path, "wb+") as f:
+            f.write(value)
+            f.flush()
+            memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        weakref.finalize(memory, _remove, path)
+        return memoryview(memory)
+
+    def close(self) -> None:
+        """Removes the spill files. Views of them that are still alive stay readable on POSIX systems."""
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+        self.path = None
+
+
+_active: Optional[SpillStore] = None
+
+
+def enable(store: Optional[SpillStore] = None) -> SpillStore:
+    """Starts spilling large pin values, with a new store unless one is given. Returns the active store."""
+    global _active
+    if _active is not store:
+        disable()
+    _active = store if store is not None else SpillStore()
+    atexit.register(_active.close)
+    return _active
+
+
+def disable() -> None:
+    """Stops spilling and removes the spill files."""
+    global _active
+    store, _active = _active, None
+    if store is not None:
+        store.close()
+        atexit.unregister(store.close)
+
+
+def get_store() -> Optional[SpillStore]:
+    return _active
+
+
+def offload(value: Any) -> Any:
+    """Spills a value to disk if a store is active and the value has to be. See SpillStore.offload."""
+    if _active is None:
+        return value
+    return _active.offload(value)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import collections
+import queue
+import threading
+from collections.abc import Iterator as _Iterator
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+# Streams let a graph push data that doesn't fit in memory through its nodes one chunk at a time. A streaming node
+# sets an iterator (usually a generator) of chunks as the value of its output pin, and the nodes downstream consume
+# it lazily, typically by returning generators of their own. Peak memory then depends on the chunk size and on the
+# buffering between stages, rather than on the size of the data.
+#
+# An output can feed several nodes, but a stream can only be consumed once. So a stream read by more than one input
+# pin is split into a branch per pin, which all yield every chunk. The chunks a branch hasn't read yet are kept
+# until it does, so readers that drift apart use memory for the chunks between them.
+
+_DONE = object()
+
+
+def is_stream(value: Any) -> bool:
+    """Returns True if the value is a stream of chunks, i.e. a one-shot iterator such as a generator."""
+    return isinstance(value, _Iterator)
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _put(buffer: queue.Queue[Any], stop: threading.Event, item: Any) -> bool:
+    # Wait for room in the buffer, but give up if the consumer went away
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(source: Iterator[Any], buffer: queue.Queue[Any], stop: threading.Event) -> None:
+    # Doesn't reference the BufferedStream itself, so an abandoned stream can be collected and stop its producer
+    try:
+        for chunk in source:
+            if not _put(buffer, stop, chunk):
+                return
+        _put(buffer, stop, _DONE)
+    except BaseException as e:
+        _put(buffer, stop, _Failure(e))
+
+
+class BufferedStream(Iterator[Any]):
+    """
+    Iterates a stream on a background thread, keeping at most `maxsize` chunks buffered ahead of the consumer.
+
+    This lets a producing stage work on the next chunks while the consuming stage processes the current one, without
+    the producer running arbitrarily far ahead. Exceptions raised by the producer are re-raised in the consumer.
+    """
+
+    def __init__(self, source: Iterable[Any], maxsize: int) -> None:
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._finished = False
+        threading.Thread(
+            target=_produce, args=(iter(source), self._queue, self._stop), name="stream-buffer", daemon=True
+        ).start()
+
+    def __iter__(self) -> BufferedStream:
+        return self
+
+    def __next__(self) -> Any:
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _DONE:
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.error
+        return item
+
+    def close(self) -> None:
+        """Stops the producer thread. Chunks that weren't consumed are dropped."""
+        self._finished = True
+        self._stop.set()
+
+    def __del__(self) -> None:
+        self._stop.set()
+
+
+class _Splitter:
+    # Reads the source once and queues every chunk for each branch. Unlike itertools.tee, the branches can be read
+    # from different threads
+
+    def __init__(self, source: Iterable[Any], branches: int) -> None:
+        self._source = iter(source)
+        self._queues: List[Deque[Any]] = [collections.deque() for _ in range(branches)]
+        self._lock = threading.Lock()
+
+    def next(self, branch: int) -> Any:
+        with self._lock:
+            chunks = self._queues[branch]
+            if not chunks:
+                chunk = next(self._source)
+                for pending in self._queues:
+                    pending.append(chunk)
+            return chunks.popleft()
+
+
+class _Branch(Iterator[Any]):
+    def __init__(self, splitter: _Splitter, branch: int) -> None:
+        self._splitter = splitter
+        self._branch = branch
+
+    def __iter__(self) -> _Branch:
+        return self
+
+    def __next__(self) -> Any:
+        return self._splitter.next(self._branch)
+
+
+class SplitStream(Iterator[Any]):
+    """
+    A stream shared by several readers, each of which gets a branch of its own from branch().
+
+    Iterating the SplitStream itself reads the branch that is handed out last, so code that isn't aware of the split
+    still sees every chunk.
+    """
+
+    def __init__(self, source: Iterable[Any], readers: int) -> None:
+        splitter = _Splitter(source, readers)
+        self._free = [_Branch(splitter, i) for i in range(readers)]
+        self._last = self._free[-1]
+        self._taken: Dict[int, _Branch] = {}
+        self._lock = threading.Lock()
+
+    def branch(self, reader: object) -> Iterator[Any]:
+        """
+        Returns the branch of a reader (e.g. an input pin), the same one every time it asks.
+
+        Raises:
+            RuntimeError: If more readers ask for a branch than the stream was split for.
+        """
+        with self._lock:
+            branch = self._taken.get(id(reader))
+            if branch is None:
+                if not self._free:
+                    raise RuntimeError("The stream has more readers than it was split for")
+                branch = self._taken[id(reader)] = self._free.pop(0)
+            return branch
+
+    def __iter__(self) -> SplitStream:
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._last)
+
+
+def split(value: Any, readers: int) -> Any:
+    """Wraps the value in a SplitStream if it is a stream with more than one reader. Other values are returned as is."""
+    if readers > 1 and is_stream(value):
+        return SplitStream(value, readers)
+    return value
+
+
+def read(value: Any, reader: object) -> Any:
+    """Returns the reader's branch of a SplitStream, or the value as is."""
+    if isinstance(value, SplitStream):
+        return value.branch(reader)
+    return value
+
+
+def buffered(value: Any, maxsize: Optional[int]) -> Any:
+    """Wraps the value in a BufferedStream if it is a stream and `maxsize` is set. Other values are returned as is."""
+    if maxsize and is_stream(value) and not isinstance(value, BufferedStream):
+        return BufferedStream(value, maxsize)
+    return value
+
+
+def iter_file_chunks(path: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Yields the contents of a file in chunks of at most `chunk_size` bytes."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
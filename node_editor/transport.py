@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import atexit
+import ctypes
+from multiprocessing import shared_memory
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+np: Optional[ModuleType]
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only bytes-like values are shared without it
+    np = None
+
+# Sending a value to a worker process pickles it through a pipe, which dominates the runtime for large arrays. Values
+# at or above a size threshold are instead copied once into a named shared memory segment, and only a small
+# SharedValue handle goes through the pipe. The receiving side maps the segment and reads the value in place: NumPy
+# arrays become read-only arrays over the segment, bytearrays and memoryviews read-only memoryviews.
+#
+# The editor owns every segment, including the ones the workers create for their outputs. A segment is referenced
+# once by every node that reads it (see SegmentRegistry), and is unlinked when the last of them is done. Values that
+# still point into an unlinked segment, e.g. an output pin's value, keep it mapped until they are released.
+
+DEFAULT_THRESHOLD = 1 << 20  # 1 MiB
+
+# See _view_key
+ViewKey = Tuple[int, int, Tuple[int, ...], str]
+
+
+class SharedValue:
+    """A handle to a value placed in a shared memory segment, cheap to pickle."""
+
+    __slots__ = ("name", "kind", "nbytes", "shape", "dtype")
+
+    def __init__(self, name: str, kind: str, nbytes: int, shape: Tuple[int, ...] = (), dtype: str = "") -> None:
+        self.name = name
+        self.kind = kind  # "ndarray", "buffer" or "bytes"
+        self.nbytes = nbytes
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self) -> Tuple[str, str, int, Tuple[int, ...], str]:
+        return (self.name, self.kind, self.nbytes, self.shape, self.dtype)
+
+    def __setstate__(self, state: Tuple[str, str, int, Tuple[int, ...], str]) -> None:
+        self.name, self.kind, self.nbytes, self.shape, self.dtype = state
+
+    def __repr__(self) -> str:
+        return f"SharedValue({self.name!r}, {self.kind}, {self.nbytes} bytes)"
+
+
+def shareable_size(value: Any) -> Optional[int]:
+    """Returns the size in bytes of a value that can be placed in shared memory, or None if it can't."""
+    if np is not None and isinstance(value, np.ndarray):
+        return None if value.dtype.hasobject else int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value.nbytes if isinstance(value, memoryview) else len(value)
+    return None
+
+
+def _buffer(segment: shared_memory.SharedMemory) -> memoryview:
+    if segment.buf is None:
+        raise ValueError(f"Shared memory segment {segment.name} is closed")
+    return segment.buf
+
+
+def export(value: Any) -> Tuple[shared_memory.SharedMemory, SharedValue]:
+    """Copies a shareable value into a new shared memory segment. The caller owns the returned segment."""
+    nbytes = shareable_size(value)
+    if nbytes is None:
+        raise TypeError(f"Can't place a {type(value).__name__} in shared memory")
+
+    # Segments can't be empty
+    segment = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    if np is not None and isinstance(value, np.ndarray):
+        target = np.ndarray(value.shape, dtype=value.dtype, buffer=_buffer(segment))
+        target[...] = value
+        del target
+        return segment, SharedValue(segment.name, "ndarray", nbytes, value.shape, value.dtype.str)
+
+    kind = "bytes" if isinstance(value, bytes) else "buffer"
+    _buffer(segment)[:nbytes] = value if not isinstance(value, memoryview) else value.cast("B")
+    return segment, SharedValue(segment.name, kind, nbytes)
+
+
+def attach(handle: SharedValue) -> Tuple[shared_memory.SharedMemory, Any]:
+    """Maps the segment of a handle and returns it with the value it holds, read in place when possible."""
+    segment = shared_memory.SharedMemory(name=handle.name)
+    return segment, view(segment, handle)
+
+
+def view(segment: shared_memory.SharedMemory, handle: SharedValue) -> Any:
+    if handle.kind == "ndarray":
+        if np is None:
+            raise ImportError("NumPy is needed to read a shared array")
+        # NumPy doesn't keep the buffer it is given exported, so the segment could be unmapped under an array made
+        # from it directly. A ctypes array does, which makes closing the segment fail for as long as the array lives.
+        memory = (ctypes.c_char * handle.nbytes).from_buffer(_buffer(segment))
+        array = np.frombuffer(memoryview(memory), dtype=np.dtype(handle.dtype)).reshape(handle.shape)
+        array.flags.writeable = False
+        return array
+    if handle.kind == "bytes":
+        # Code reading bytes expects bytes, not a memoryview, so this one is copied out of the segment
+        return bytes(_buffer(segment)[: handle.nbytes])
+    return _buffer(segment)[: handle.nbytes].toreadonly()
+
+
+# Segments that were closed while values still pointed into them. See close()
+_retired: List[shared_memory.SharedMemory] = []
+
+
+def close(segment: shared_memory.SharedMemory) -> None:
+    """
+    Unmaps a segment from this process. If values still point into it, it is retired instead and unmapped by a
+    later collect_retired(), once they are gone.
+    """
+    try:
+        segment.close()
+    except BufferError:
+        _retired.append(segment)
+
+
+def collect_retired() -> None:
+    """Unmaps the retired segments that are no longer referenced."""
+    segments = list(_retired)
+    _retired.clear()
+    for segment in segments:
+        close(segment)
+
+
+def _release_retired() -> None:
+    # Output pins may still point into retired segments when the interpreter exits. SharedMemory.__del__ would fail to
+    # unmap them and print a BufferError, so the mappings are left to those values instead: the segment drops its own
+    # references to the mapping, which is unmapped once the last value pointing into it is collected
+    collect_retired()
+    for segment in _retired:
+        setattr(segment, "_buf", None)
+        setattr(segment, "_mmap", None)
+        segment.close()  # Only closes the file descriptor now
+    _retired.clear()
+
+
+atexit.register(_release_retired)
+
+
+def _view_key(value: Any) -> Optional[ViewKey]:
+    # Identifies the memory an array reads: the object that owns it (e.g. the mmap of a segment), the address of its
+    # first element, its shape and its dtype. Two arrays with the same key read the same value.
+    if np is None or not isinstance(value, np.ndarray) or not value.flags.c_contiguous:
+        return None
+    root = value
+    while isinstance(root, np.ndarray) and root.base is not None:
+        root = root.base
+    return (id(root), value.__array_interface__["data"][0], value.shape, value.dtype.str)
+
+
+class SegmentRegistry:
+    """
+    The shared memory segments of one execution, referenced by the nodes that read them.
+
+    A worker's output segment is referenced once by each of its downstream nodes, and an input segment by the node
+    it was made for. When a node is done, it releases its references, and a segment is unlinked as soon as nobody
+    references it anymore, so large intermediate values don't outlive their last consumer.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._segments: Dict[str, Tuple[shared_memory.SharedMemory, SharedValue]] = {}
+        self._refs: Dict[str, int] = {}
+        # The segments referenced by every node, by node index
+        self._held: Dict[int, List[str]] = {}
+        # The segments of the arrays received from the workers, by _view_key, to send them on without copying
+        self._by_view: Dict[ViewKey, str] = {}
+        self._view_keys: Dict[str, ViewKey] = {}
+
+    def _add(self, segment: shared_memory.SharedMemory, handle: SharedValue, holders: Iterable[int]) -> None:
+        self._segments[handle.name] = (segment, handle)
+        self._refs[handle.name] = 0
+        for holder in holders:
+            self._hold(handle.name, holder)
+        if self._refs[handle.name] == 0:
+            self._unlink(handle.name)
+
+    def _hold(self, name: str, holder: int) -> None:
+        self._refs[name] += 1
+        self._held.setdefault(holder, []).append(name)
+
+    def share_inputs(self, inputs: Dict[str, Any], holder: int) -> Dict[str, Any]:
+        """
+        Returns the inputs of a node with the values above the threshold replaced by handles.
+
+        A value that already points into one of the segments, e.g. the output of an upstream worker, is sent as a
+        handle to that segment without copying. Other values are copied into a new segment.
+        """
+        shared = dict(inputs)
+        for name, value in inputs.items():
+            size = shareable_size(value)
+            if size is None or size < self.threshold:
+                continue
+            key = _view_key(value)
+            segment_name = self._by_view.get(key) if key is not None else None
+            if segment_name is not None:
+                self._hold(segment_name, holder)
+                shared[name] = self._segments[segment_name][1]
+                continue
+            segment, handle = export(value)
+            self._add(segment, handle, [holder])
+            shared[name] = handle
+        return shared
+
+    def receive_outputs(self, outputs: Dict[str, Any], holders: Iterable[int]) -> Dict[str, Any]:
+        """
+        Maps the segments of the handles among a worker's outputs and returns the outputs with the values read in
+        place. The segments are referenced by the holders, the nodes downstream of the worker's node.
+        """
+        holders = list(holders)
+        received = dict(outputs)
+        for name, value in outputs.items():
+            if isinstance(value, SharedValue):
+                segment, received[name] = attach(value)
+                key = _view_key(received[name])
+                if key is not None:
+                    self._by_view[key] = value.name
+                    self._view_keys[value.name] = key
+                self._add(segment, value, holders)
+        return received
+
+    def hold_views(self, values: Iterable[Any], holders: Iterable[int]) -> None:
+        """
+        References the segments that values point into once for each holder, e.g. when a node running in the editor
+        passed a worker's output on, so its downstream nodes can still send it on without copying.
+        """
+        holders = list(holders)
+        for value in values:
+            key = _view_key(value)
+            segment_name = self._by_view.get(key) if key is not None else None
+            if segment_name is not None:
+                for holder in holders:
+                    self._hold(segment_name, holder)
+
+    def release(self, holder: int) -> None:
+        """Drops the references of a node, unlinking the segments nobody references anymore."""
+        for name in self._held.pop(holder, []):
+            self._refs[name] -= 1
+            if self._refs[name] == 0:
+                self._unlink(name)
+
+    def _unlink(self, name: str) -> None:
+        segment, _ = self._segments.pop(name)
+        key = self._view_keys.pop(name, None)
+        if key is not None:
+            self._by_view.pop(key, None)
+        del self._refs[name]
+        segment.unlink()
+        close(segment)
+
+    def release_all(self) -> None:
+        """Unlinks every segment, e.g. once the execution stopped."""
+        for name in list(self._segments):
+            self._unlink(name)
+        self._held.clear()
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+
+def discard(outputs: Dict[str, Any]) -> None:
+    """Unlinks the segments of the handles among a worker's outputs that won't be received, e.g. of a timed out node."""
+    for value in outputs.values():
+        if not isinstance(value, SharedValue):
+            continue
+        try:
+            segment = shared_memory.SharedMemory(name=value.name)
+        except OSError:
+            continue
+        segment.unlink()
+        close(segment)
+
+
+# Worker side
+
+
+def receive_inputs(inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], List[shared_memory.SharedMemory]]:
+    """Maps the segments of the handles among a node's inputs. Returns the inputs and the mapped segments."""
+    received = dict(inputs)
+    segments = []
+    for name, value in inputs.items():
+        if isinstance(value, SharedValue):
+            segment, received[name] = attach(value)
+            segments.append(segment)
+    return received, segments
+
+
+def share_outputs(outputs: Dict[str, Any], threshold: int) -> Dict[str, Any]:
+    """
+    Copies the outputs above the threshold into new segments and returns the outputs with handles in their place.
+    The segments are unmapped from the worker, the editor takes them over.
+    """
+    shared = dict(outputs)
+    for name, value in outputs.items():
+        size = shareable_size(value)
+        if size is None or size < threshold:
+            continue
+        segment, shared[name] = export(value)
+        close(segment)
+    return shared